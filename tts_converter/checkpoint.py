@@ -3,153 +3,414 @@
 Checkpoint and resume functionality for the TTS converter.
 """
 import os
-import glob
 import json
 import time
-import stat
 import sqlite3
-import hashlib
+import threading
+from contextlib import closing, contextmanager
+from urllib.request import pathname2url
 from .config import Config
+from .utils import TTSUtils
+
+# Per-connection tuning applied to every checkpoint database connection.
+# WAL turns each commit into a single append to the -wal file, so NORMAL
+# sync is durable enough for progress checkpoints.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",      # 64 MiB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MiB memory-mapped IO
+)
+
+# Sidecar files SQLite keeps next to a WAL-mode database
+_DB_SIDECAR_SUFFIXES = ('-wal', '-shm')
+
+# Statuses whose saves may be buffered; any other status is committed at once
+_BATCHED_STATUSES = ('in_progress', 'processing')
+
 
 class CheckpointManager:
     """Manages checkpoint/resume functionality."""
     
+    # SQL statements are kept as constants so each cached connection reuses
+    # its prepared statements across calls.
+    _SQL_CREATE_TABLE = '''
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            id INTEGER PRIMARY KEY,
+            file_path TEXT UNIQUE,
+            total_chunks INTEGER,
+            completed_chunks INTEGER,
+            failed_chunks TEXT,
+            temp_files TEXT,
+            output_file TEXT,
+            language TEXT,
+            slow INTEGER,
+            status TEXT,
+            cumulative_processing_time REAL DEFAULT 0.0,
+            session_start_time REAL,
+            file_prefix TEXT,
+            created_at REAL,  -- Unix timestamps bound from Python
+            updated_at REAL
+        )
+    '''
+    _SQL_CREATE_INDEX = '''
+        CREATE INDEX IF NOT EXISTS idx_ckpt_path_status ON checkpoints(file_path, status)
+    '''
+    # UPSERT (SQLite 3.24+) updates the existing row in place instead of the
+    # DELETE + INSERT done by INSERT OR REPLACE, so created_at stays stable.
+    # A NULL cumulative time (?10) keeps the stored value.
+    _SQL_SAVE = '''
+        INSERT INTO checkpoints 
+        (file_path, total_chunks, completed_chunks, failed_chunks, temp_files, 
+         output_file, language, slow, status, cumulative_processing_time, session_start_time, file_prefix,
+         created_at, updated_at)
+        VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, IFNULL(?10, 0.0), ?11, ?12, ?13, ?13)
+        ON CONFLICT(file_path) DO UPDATE SET
+            total_chunks = excluded.total_chunks,
+            completed_chunks = excluded.completed_chunks,
+            failed_chunks = excluded.failed_chunks,
+            temp_files = excluded.temp_files,
+            output_file = excluded.output_file,
+            language = excluded.language,
+            slow = excluded.slow,
+            status = excluded.status,
+            cumulative_processing_time = IFNULL(?10, cumulative_processing_time),
+            session_start_time = excluded.session_start_time,
+            file_prefix = IFNULL(excluded.file_prefix, file_prefix),
+            updated_at = excluded.updated_at
+    '''
+    _SQL_LOAD = '''
+        SELECT file_path, total_chunks, completed_chunks, failed_chunks, temp_files,
+               output_file, language, slow, status, cumulative_processing_time,
+               session_start_time, file_prefix
+        FROM checkpoints WHERE file_path = ? AND status != 'completed'
+    '''
+    _SQL_MARK_COMPLETED = '''
+        UPDATE checkpoints SET status = 'completed', updated_at = ? WHERE file_path = ?
+    '''
+    _SQL_COUNT_INCOMPLETE = "SELECT COUNT(*) FROM checkpoints WHERE status != 'completed'"
+    _SQL_ADD_TIME = '''
+        UPDATE checkpoints 
+        SET cumulative_processing_time = cumulative_processing_time + ?,
+            updated_at = ?
+        WHERE file_path = ?
+    '''
+    _SQL_UPDATE_PROGRESS = '''
+        UPDATE checkpoints SET completed_chunks = ?, 
+        cumulative_processing_time = COALESCE(?, cumulative_processing_time), 
+        updated_at = ? WHERE file_path = ?
+    '''
+    _SQL_GET_TIME = 'SELECT cumulative_processing_time FROM checkpoints WHERE file_path = ?'
+    _SQL_HAS_ACTIVE = "SELECT 1 FROM checkpoints WHERE file_path = ? AND status != 'completed'"
+    _SQL_DELETE = 'DELETE FROM checkpoints WHERE file_path = ?'
+    
     def __init__(self, db_path=None):
-        # Store the main database path but don't create it yet
+        # All conversions share one database, partitioned by file_path/file_prefix.
+        # Store its path but don't create it yet.
         if db_path is None:
-            self.main_db_path = os.path.join(Config.get_project_path(), "tts_checkpoints.db")
+            self.db_path = os.path.join(Config.get_project_path(), "tts_checkpoints.db")
         else:
-            self.main_db_path = db_path
-        self.current_db_path = self.main_db_path  # Default to main path
-    
-    def _get_prefixed_db_path(self, file_path, prefix=None):
-        """Get the database path specific to this file/prefix."""
-        project_dir = Config.get_project_path()
+            self.db_path = db_path
+        self._conns = {}  # Long-lived connections keyed by database path
+        self._initialized = False  # Schema is created on the first write, not here
         
-        # If no prefix provided, use the base filename without extension
-        if not prefix:
-            prefix = os.path.splitext(os.path.basename(file_path))[0]
-            
-        # Create a sanitized prefix for filenames
-        safe_prefix = "".join(c for c in prefix if c.isalnum() or c in ('-', '_')).lower()
+        # In-progress saves are buffered and committed together every
+        # _flush_every calls; only the latest row per file is kept.
+        self._pending = {}  # file_path -> row parameters
+        self._pending_narrow = {}  # file_path -> (completed_chunks, cumulative_time, updated_at, file_path)
+        self._pending_count = 0
+        self._pending_lock = threading.Lock()
+        self._flush_every = 16
         
-        # Create a unique identifier from the file path
-        file_hash = hashlib.md5(file_path.encode()).hexdigest()[:8]
+        # Batched flushes run on a background writer thread so chunk workers
+        # never wait on disk; _write_lock keeps all writes on the shared
+        # connection ordered, whichever thread issues them.
+        self._write_lock = threading.RLock()
+        self._writer = None
+        self._writer_wake = threading.Event()
+        self._writer_stop = False
         
-        # Create the prefixed database path
-        return os.path.join(project_dir, f"tts_checkpoints_{safe_prefix}_{file_hash}.db")
+        # Last state handed to the database per file, used to skip no-op saves
+        self._last_saved = {}  # file_path -> state tuple
+        self._cumtime = {}  # file_path -> cumulative processing time mirrored from the database
+    
+    @staticmethod
+    def _connect(db_path):
+        """Open a connection to a checkpoint database with tuned PRAGMAs."""
+        conn = sqlite3.connect(db_path, isolation_level=None, timeout=30.0,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _get_connection(self, db_path):
+        """Return the cached connection for a database, opening it on first use."""
+        conn = self._conns.get(db_path)
+        if conn is None:
+            conn = self._connect(db_path)
+            self._conns[db_path] = conn
+        return conn
+    
+    @contextmanager
+    def _write_transaction(self, db_path):
+        """Run a write inside BEGIN IMMEDIATE so the write lock is taken up front."""
+        with self._write_lock:
+            conn = self._get_connection(db_path)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+    
+    def _close_connection(self, db_path):
+        """Close and forget the cached connection for a database, if any."""
+        conn = self._conns.pop(db_path, None)
+        if conn is not None:
+            conn.close()
+    
+    def _discard_database(self, db_path):
+        """Close any cached connection and remove the database files."""
+        with self._write_lock:
+            self._close_connection(db_path)
+            self._remove_db_file(db_path)
+            if db_path == self.db_path:
+                self._initialized = False
+                self._last_saved.clear()
+                self._cumtime.clear()
+    
+    def close(self):
+        """Stop the writer thread, flush buffered progress and close all cached connections."""
+        writer = self._writer
+        if writer is not None and writer is not threading.current_thread():
+            self._writer_stop = True
+            self._writer_wake.set()
+            writer.join(timeout=5.0)
+            self._writer = None
+        self.flush()
+        with self._write_lock:
+            for db_path in list(self._conns):
+                self._close_connection(db_path)
+            self._initialized = False
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _remove_db_file(db_path):
+        """Remove a checkpoint database along with its WAL sidecar files."""
+        os.remove(db_path)
+        for suffix in _DB_SIDECAR_SUFFIXES:
+            try:
+                os.remove(db_path + suffix)
+            except FileNotFoundError:
+                pass
+    
+    @staticmethod
+    def _scan_project(directory):
+        """List a directory once and sort its entries into checkpoint-related buckets."""
+        buckets = {'db_files': [], 'boundary_files': [], 'temp_files': [], 'mp3_files': []}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith('.mp3'):
+                        if name.startswith(Config.TEMP_FILE_PREFIX):
+                            buckets['temp_files'].append(entry.path)
+                        else:
+                            buckets['mp3_files'].append(entry.path)
+                    elif name.endswith(Config.CHUNK_BOUNDARIES_SUFFIX):
+                        buckets['boundary_files'].append(entry.path)
+                    elif name.startswith('tts_checkpoints') and name.endswith('.db'):
+                        # The shared database plus any legacy per-file databases
+                        buckets['db_files'].append(entry.path)
+        except FileNotFoundError:
+            pass
+        return buckets
+    
+    @staticmethod
+    def _scan_audio_files(directory):
+        """List every .mp3 file in a directory with a single scan."""
+        try:
+            with os.scandir(directory) as entries:
+                return [entry.path for entry in entries
+                        if entry.name.endswith('.mp3') and entry.is_file()]
+        except FileNotFoundError:
+            return []
     
     def _init_database(self, db_path):
         """Initialize checkpoint database at the specified path."""
-        with sqlite3.connect(db_path) as conn:
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS checkpoints (
-                    id INTEGER PRIMARY KEY,
-                    file_path TEXT UNIQUE,
-                    total_chunks INTEGER,
-                    completed_chunks INTEGER,
-                    failed_chunks TEXT,
-                    temp_files TEXT,
-                    output_file TEXT,
-                    language TEXT,
-                    slow INTEGER,
-                    status TEXT,
-                    cumulative_processing_time REAL DEFAULT 0.0,
-                    session_start_time REAL,
-                    file_prefix TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+        with self._get_connection(db_path) as conn:
+            # WAL is persistent per database file, so it only needs setting once
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(self._SQL_CREATE_TABLE)
+            conn.execute(self._SQL_CREATE_INDEX)
+    
+    def _ensure_db(self):
+        """Create the shared database and schema on first write."""
+        if not self._initialized:
+            self._init_database(self.db_path)
+            self._initialized = True
     
     def save_progress(self, file_path, total_chunks, completed_chunks, failed_chunks, 
                      temp_files, output_file, language, slow, status, cumulative_time=None, session_start=None, prefix=None):
         """Save processing progress with timing information."""
-        # Get the prefixed database path
-        self.current_db_path = self._get_prefixed_db_path(file_path, prefix)
+        # Skip the write entirely when nothing has changed since the last save; every
+        # persisted column is part of the key (completed_chunks stays at index 1)
+        state = (total_chunks, completed_chunks, len(failed_chunks), len(temp_files), status,
+                 output_file, language, bool(slow), prefix, session_start, cumulative_time)
+        last = self._last_saved.get(file_path)
+        if state == last:
+            return
+        self._last_saved[file_path] = state
+        if cumulative_time is not None:
+            self._cumtime[file_path] = cumulative_time
         
-        # Ensure the database exists
-        if not os.path.exists(self.current_db_path):
-            self._init_database(self.current_db_path)
+        now = time.time()
+        with self._pending_lock:
+            if (last is not None and file_path not in self._pending
+                    and last[:1] + last[2:] == state[:1] + state[2:]):
+                # Only completed_chunks moved: update just that column
+                self._pending_narrow[file_path] = (completed_chunks, cumulative_time, now, file_path)
+            else:
+                # Snapshot the lists (callers keep appending to them) but defer JSON
+                # encoding to flush(), so only the row that is actually written pays for it
+                self._pending_narrow.pop(file_path, None)
+                self._pending[file_path] = (
+                    file_path, total_chunks, completed_chunks, list(failed_chunks),
+                    list(temp_files), output_file, language, int(slow), status, 
+                    cumulative_time, session_start or now, prefix, now)
+            self._pending_count += 1
+            batch_full = self._pending_count >= self._flush_every
         
-        with sqlite3.connect(self.current_db_path) as conn:
-            conn.execute('''
-                INSERT OR REPLACE INTO checkpoints 
-                (file_path, total_chunks, completed_chunks, failed_chunks, temp_files, 
-                 output_file, language, slow, status, cumulative_processing_time, session_start_time, file_prefix, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (file_path, total_chunks, completed_chunks, json.dumps(failed_chunks),
-                  json.dumps(temp_files), output_file, language, int(slow), status, 
-                  cumulative_time or 0.0, session_start or time.time(), prefix))
+        if status not in _BATCHED_STATUSES:
+            # Final states (completed, failed, force_stopped...) are written
+            # before returning so they survive an immediate exit
+            self.flush()
+        elif batch_full:
+            self._request_flush()
+    
+    def _request_flush(self):
+        """Hand the buffered saves to the background writer thread."""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer_stop = False
+            self._writer = threading.Thread(target=self._writer_loop, name="checkpoint-writer", daemon=True)
+            self._writer.start()
+        self._writer_wake.set()
+    
+    def _writer_loop(self):
+        """Commit buffered saves whenever a batch is ready, until closed."""
+        while True:
+            self._writer_wake.wait()
+            self._writer_wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Could not save checkpoint: {e}")
+            if self._writer_stop:
+                return
+    
+    def flush(self):
+        """Commit all buffered progress saves in one transaction."""
+        # Hold the write lock from snapshot to commit so batches land in order
+        with self._write_lock:
+            with self._pending_lock:
+                if not self._pending and not self._pending_narrow:
+                    return
+                pending, self._pending = self._pending, {}
+                narrow, self._pending_narrow = self._pending_narrow, {}
+                self._pending_count = 0
+            
+            # Encode before BEGIN IMMEDIATE to keep the SQLite transaction short
+            rows = [row[:3] + (json.dumps(row[3]), json.dumps(row[4])) + row[5:]
+                    for row in pending.values()]
+            
+            self._ensure_db()
+            with self._write_transaction(self.db_path) as conn:
+                if rows:
+                    conn.executemany(self._SQL_SAVE, rows)
+                if narrow:
+                    conn.executemany(self._SQL_UPDATE_PROGRESS, list(narrow.values()))
     
     def load_progress(self, file_path):
         """Load existing progress with timing information."""
-        # First check for any existing prefixed database for this file
-        project_dir = Config.get_project_path()
-        file_hash = hashlib.md5(file_path.encode()).hexdigest()[:8]
-        possible_dbs = glob.glob(os.path.join(project_dir, f"tts_checkpoints_*_{file_hash}.db"))
+        self.flush()
         
-        # Also check the main database for legacy entries
-        if os.path.exists(self.main_db_path):
-            possible_dbs.append(self.main_db_path)
+        if not os.path.exists(self.db_path):
+            return None
         
-        for db_path in possible_dbs:
-            try:
-                with sqlite3.connect(db_path) as conn:
-                    cursor = conn.execute(
-                        'SELECT * FROM checkpoints WHERE file_path = ? AND status != "completed"',
-                        (file_path,)
-                    )
-                    result = cursor.fetchone()
-                    
-                    if result:
-                        # Store the current database path for future operations
-                        self.current_db_path = db_path
-                        
-                        return {
-                            'file_path': result[1],
-                            'total_chunks': result[2], 
-                            'completed_chunks': result[3],
-                            'failed_chunks': json.loads(result[4]) if result[4] else [],
-                            'temp_files': json.loads(result[5]) if result[5] else [],
-                            'output_file': result[6],
-                            'language': result[7],
-                            'slow': bool(result[8]),
-                            'status': result[9],
-                            'cumulative_processing_time': result[10] if len(result) > 10 else 0.0,
-                            'session_start_time': result[11] if len(result) > 11 else time.time(),
-                            'file_prefix': result[12] if len(result) > 12 else None
-                        }
-            except sqlite3.Error:
-                continue  # Try next database if this one fails
-                
-        return None
+        try:
+            row = self._get_connection(self.db_path).execute(self._SQL_LOAD, (file_path,)).fetchone()
+        except sqlite3.Error:
+            return None
+        
+        if not row:
+            return None
+        
+        progress = dict(row)
+        progress['failed_chunks'] = json.loads(row['failed_chunks']) if row['failed_chunks'] else []
+        progress['temp_files'] = json.loads(row['temp_files']) if row['temp_files'] else []
+        progress['slow'] = bool(row['slow'])
+        progress['cumulative_processing_time'] = row['cumulative_processing_time'] or 0.0
+        if progress['session_start_time'] is None:
+            progress['session_start_time'] = time.time()
+        return progress
+    
+    def _has_active_progress(self, file_path):
+        """Check whether a file has an unfinished conversion recorded."""
+        if not os.path.exists(self.db_path):
+            return False
+        return self._get_connection(self.db_path).execute(self._SQL_HAS_ACTIVE, (file_path,)).fetchone() is not None
+    
+    def _count_incomplete(self, db_path):
+        """Count unfinished conversions recorded in a checkpoint database."""
+        if db_path == self.db_path:
+            return self._get_connection(db_path).execute(self._SQL_COUNT_INCOMPLETE).fetchone()[0]
+        
+        # Legacy databases are only inspected: use a short-lived connection that
+        # is closed again before cleanup removes the files
+        if os.path.exists(db_path + '-wal'):
+            # Unreplayed WAL: a normal connection sees the committed rows in it
+            with closing(sqlite3.connect(db_path, timeout=30.0)) as conn:
+                return conn.execute(self._SQL_COUNT_INCOMPLETE).fetchone()[0]
+        
+        # Otherwise open read-only and immutable so no -wal/-shm files or locks are created
+        if os.path.getsize(db_path) == 0:
+            return 0
+        with closing(sqlite3.connect(f"file:{pathname2url(db_path)}?mode=ro&immutable=1", uri=True)) as conn:
+            return conn.execute(self._SQL_COUNT_INCOMPLETE).fetchone()[0]
+    
+    def _remove_if_all_completed(self, db_path):
+        """Remove a checkpoint database once it has no incomplete entries."""
+        incomplete = self._count_incomplete(db_path)
+        if incomplete == 0:
+            self._discard_database(db_path)
+            print(f"🧹 Removed completed checkpoint database: {os.path.basename(db_path)}")
+        return incomplete
     
     def mark_completed(self, file_path):
         """Mark processing as completed."""
-        if self.current_db_path:
-            with sqlite3.connect(self.current_db_path) as conn:
-                conn.execute(
-                    'UPDATE checkpoints SET status = "completed", updated_at = CURRENT_TIMESTAMP WHERE file_path = ?',
-                    (file_path,)
-                )
+        self.flush()
+        self._last_saved.pop(file_path, None)
+        if os.path.exists(self.db_path):
+            with self._write_transaction(self.db_path) as conn:
+                conn.execute(self._SQL_MARK_COMPLETED, (time.time(), file_path))
             
-            # After marking as completed, try to clean up this specific database
+            # After marking as completed, remove the database if nothing else is in flight
             try:
-                # Check if there are any incomplete entries
-                with sqlite3.connect(self.current_db_path) as conn:
-                    cursor = conn.execute('SELECT COUNT(*) FROM checkpoints WHERE status != "completed"')
-                    incomplete = cursor.fetchone()[0]
-                
-                if incomplete == 0:
-                    # No incomplete entries, safe to remove this database
-                    os.remove(self.current_db_path)
-                    print(f"🧹 Removed completed checkpoint database: {os.path.basename(self.current_db_path)}")
+                self._remove_if_all_completed(self.db_path)
             except Exception as e:
                 print(f"⚠️ Could not clean up completed database: {e}")
     
     def cleanup_database_files(self, project_dir=None):
-        """Clean up all checkpoint database files."""
+        """Clean up the checkpoint database and any legacy per-file databases."""
+        self.flush()
         if project_dir is None:
             project_dir = Config.get_project_path()
             
@@ -157,24 +418,18 @@ class CheckpointManager:
             files_cleaned = 0
             
             # Find and remove all checkpoint database files
-            db_files = glob.glob(os.path.join(project_dir, "tts_checkpoints_*.db"))
+            db_files = self._scan_project(project_dir)['db_files']
             for db_file in db_files:
                 try:
-                    with sqlite3.connect(db_file) as conn:
-                        # Check if all entries are completed
-                        cursor = conn.execute('SELECT COUNT(*) FROM checkpoints WHERE status != "completed"')
-                        incomplete = cursor.fetchone()[0]
-                        
-                        if incomplete == 0:
-                            # All entries completed, safe to remove
-                            os.remove(db_file)
-                            print(f"🧹 Removed completed checkpoint database: {os.path.basename(db_file)}")
-                            files_cleaned += 1
-                        else:
-                            print(f"ℹ️ Database {os.path.basename(db_file)} has {incomplete} active conversions")
+                    # Remove the database if all entries are completed
+                    incomplete = self._remove_if_all_completed(db_file)
+                    if incomplete == 0:
+                        files_cleaned += 1
+                    else:
+                        print(f"ℹ️ Database {os.path.basename(db_file)} has {incomplete} active conversions")
                 except sqlite3.Error:
                     # Database might be corrupted
-                    os.remove(db_file)
+                    self._discard_database(db_file)
                     print(f"🧹 Removed corrupted database file: {os.path.basename(db_file)}")
                     files_cleaned += 1
                 except Exception as e:
@@ -188,44 +443,39 @@ class CheckpointManager:
     
     def cleanup_progress_files(self, file_path=None):
         """Clean up progress files for a specific file or all completed files."""
+        self.flush()
         try:
             if file_path:
-                # Get the specific database for this file
-                self.current_db_path = self._get_prefixed_db_path(file_path)
+                self._cumtime.pop(file_path, None)
                 
-                if os.path.exists(self.current_db_path):
-                    with sqlite3.connect(self.current_db_path) as conn:
-                        # Check if there are any incomplete entries
-                        cursor = conn.execute('SELECT COUNT(*) FROM checkpoints WHERE status != "completed"')
-                        incomplete = cursor.fetchone()[0]
-                        
-                        if incomplete == 0:
-                            # No incomplete entries, safe to remove database
-                            os.remove(self.current_db_path)
-                            print(f"🧹 Removed completed checkpoint database: {os.path.basename(self.current_db_path)}")
+                # Remove the database if no conversion is still in flight
+                if os.path.exists(self.db_path):
+                    self._remove_if_all_completed(self.db_path)
                 
                 # Clean up boundaries file
                 boundary_file = file_path + Config.CHUNK_BOUNDARIES_SUFFIX
-                if os.path.exists(boundary_file):
+                try:
                     os.remove(boundary_file)
                     print(f"🧹 Removed boundaries file: {os.path.basename(boundary_file)}")
+                except FileNotFoundError:
+                    pass
             else:
                 # Clean up all completed progress files
                 self.cleanup_database_files()
                 
                 # Clean up all boundary files for completed conversions
                 project_dir = Config.get_project_path()
-                boundaries = glob.glob(os.path.join(project_dir, "*_chunk_boundaries.json"))
-                for b_file in boundaries:
+                for b_file in self._scan_project(project_dir)['boundary_files']:
                     try:
-                        # Check if there's an active database for this file
+                        # Check if there's an active conversion for this file
                         file_path = b_file[:-len(Config.CHUNK_BOUNDARIES_SUFFIX)]
-                        db_path = self._get_prefixed_db_path(file_path)
                         
-                        if not os.path.exists(db_path):
-                            # No active database, safe to remove boundary file
+                        if not self._has_active_progress(file_path):
+                            # No active conversion, safe to remove boundary file
                             os.remove(b_file)
                             print(f"🧹 Removed boundaries file: {os.path.basename(b_file)}")
+                    except FileNotFoundError:
+                        pass
                     except Exception as e:
                         print(f"⚠️ Could not check/remove boundary file: {e}")
                 
@@ -234,70 +484,79 @@ class CheckpointManager:
     
     def update_cumulative_time(self, file_path, additional_time):
         """Update the cumulative processing time for a file."""
-        if self.current_db_path and os.path.exists(self.current_db_path):
-            with sqlite3.connect(self.current_db_path) as conn:
-                conn.execute('''
-                    UPDATE checkpoints 
-                    SET cumulative_processing_time = cumulative_processing_time + ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE file_path = ?
-                ''', (additional_time, file_path))
+        self.flush()
+        if os.path.exists(self.db_path):
+            with self._write_transaction(self.db_path) as conn:
+                updated = conn.execute(self._SQL_ADD_TIME, (additional_time, time.time(), file_path)).rowcount
+            if updated and file_path in self._cumtime:
+                self._cumtime[file_path] += additional_time
     
     def get_cumulative_time(self, file_path):
         """Get the cumulative processing time for a file."""
-        if self.current_db_path and os.path.exists(self.current_db_path):
-            with sqlite3.connect(self.current_db_path) as conn:
-                cursor = conn.execute(
-                    'SELECT cumulative_processing_time FROM checkpoints WHERE file_path = ?',
-                    (file_path,)
-                )
-                result = cursor.fetchone()
-                return result[0] if result else 0.0
-        return 0.0
+        cached = self._cumtime.get(file_path)
+        if cached is not None:
+            return cached
+        
+        self.flush()
+        total = 0.0
+        if os.path.exists(self.db_path):
+            cursor = self._get_connection(self.db_path).execute(self._SQL_GET_TIME, (file_path,))
+            result = cursor.fetchone()
+            if result and result[0] is not None:
+                total = result[0]
+        self._cumtime[file_path] = total
+        return total
     
-    def delete_all_progress(self, file_path):
-        """Delete all progress data and temp files for a specific file."""
+    def delete_all_progress(self, file_paths):
+        """Delete all progress data and temp files for one file or an iterable of files."""
+        if isinstance(file_paths, str):
+            file_paths = [file_paths]
+        else:
+            file_paths = list(file_paths)
         project_dir = Config.get_project_path()
         
+        # Drop any buffered saves for these files so they aren't written back later
+        with self._pending_lock:
+            for file_path in file_paths:
+                self._pending.pop(file_path, None)
+                self._pending_narrow.pop(file_path, None)
+        for file_path in file_paths:
+            self._last_saved.pop(file_path, None)
+            self._cumtime.pop(file_path, None)
+        
         try:
             print("🗑️ Deleting all progress data...")
             
-            # Get the specific database path for this file
-            db_path = self._get_prefixed_db_path(file_path)
-            
-            if os.path.exists(db_path):
+            # Remove the checkpoint rows from the shared database in one transaction
+            if os.path.exists(self.db_path):
                 try:
-                    os.remove(db_path)
-                    print(f"🗑️ Removed checkpoint database: {os.path.basename(db_path)}")
+                    with self._write_transaction(self.db_path) as conn:
+                        conn.executemany(self._SQL_DELETE, [(fp,) for fp in file_paths])
+                    print(f"🗑️ Removed checkpoint entries from {os.path.basename(self.db_path)}")
                 except Exception as e:
-                    print(f"⚠️ Could not remove checkpoint database: {e}")
+                    print(f"⚠️ Could not remove checkpoint entries: {e}")
             
-            # Remove boundaries file
-            boundary_file = file_path + Config.CHUNK_BOUNDARIES_SUFFIX
-            if os.path.exists(boundary_file):
-                os.remove(boundary_file)
-                print(f"🗑️ Removed boundaries file: {os.path.basename(boundary_file)}")
+            # Remove boundaries files
+            for file_path in file_paths:
+                boundary_file = file_path + Config.CHUNK_BOUNDARIES_SUFFIX
+                try:
+                    os.remove(boundary_file)
+                    print(f"🗑️ Removed boundaries file: {os.path.basename(boundary_file)}")
+                except FileNotFoundError:
+                    pass
             
             # Remove all temp chunk files for this conversion - check both current directory and output directory
-            for search_dir in [project_dir, Config.get_default_output_dir()]:
-                if os.path.exists(search_dir):
-                    # Check for legacy pattern files (temp_chunk_*.mp3)
-                    temp_pattern = os.path.join(search_dir, f"{Config.TEMP_FILE_PREFIX}*.mp3")
-                    temp_files = glob.glob(temp_pattern)
-                    
-                    # Also check for custom named files (any mp3 files in the directory)
-                    custom_pattern = os.path.join(search_dir, "*.mp3")
-                    custom_files = glob.glob(custom_pattern)
-                    
-                    all_files = temp_files + custom_files
-                    if all_files:
-                        print(f"🗑️ Found {len(all_files)} audio files in {search_dir} to remove...")
-                        for temp_file in all_files:
-                            try:
-                                os.remove(temp_file)
-                                print(f"🗑️ Removed: {os.path.basename(temp_file)}")
-                            except Exception as e:
-                                print(f"⚠️ Could not remove {temp_file}: {e}")
+            # (dict.fromkeys keeps the order and avoids scanning the same directory twice)
+            search_dirs = dict.fromkeys(os.path.normpath(d) for d in (project_dir, Config.get_default_output_dir()))
+            for search_dir in search_dirs:
+                # Legacy temp_chunk_*.mp3 files plus custom named audio files
+                all_files = self._scan_audio_files(search_dir)
+                if all_files:
+                    print(f"🗑️ Found {len(all_files)} audio files in {search_dir} to remove...")
+                    failures = TTSUtils.remove_files(all_files)
+                    for temp_file, e in failures:
+                        print(f"⚠️ Could not remove {temp_file}: {e}")
+                    print(f"🗑️ Removed {len(all_files) - len(failures)} audio files")
             
             print("✅ All progress data deleted successfully!")
             
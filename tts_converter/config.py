@@ -3,6 +3,28 @@
 Configuration settings for the TTS converter.
 """
 import os
+from functools import lru_cache
+
+
+# Pure path helpers behind the Config methods below. Every input - including
+# BASE_DIR, which callers may reassign - is part of the cache key.
+@lru_cache(maxsize=1024)
+def _absolute_path(relative_path, base_dir):
+    if os.path.isabs(relative_path):
+        return relative_path
+    return os.path.join(base_dir, relative_path)
+
+
+@lru_cache(maxsize=1024)
+def _temp_filename(chunk_index, output_dir, file_prefix, base_dir):
+    # Format: prefix + " " + number + .mp3  (e.g., "book audio 1.mp3")
+    filename = f"{file_prefix} {chunk_index + 1}.mp3"
+    
+    if output_dir:
+        # Make sure output_dir is absolute
+        return os.path.join(_absolute_path(output_dir, base_dir), filename)
+    return filename
+
 
 class Config:
     """Configuration settings for the TTS converter."""
@@ -14,10 +36,13 @@ class Config:
     DEFAULT_CHUNK_SIZE = 5000  # Matches TTS 1.py chunk size
     MAX_RETRIES = 3
     RETRY_DELAY = 2
+    MAX_RETRY_DELAY = 30  # Upper bound for one backoff sleep, including server Retry-After hints
+    REQUEST_TIMEOUT = 30  # Seconds per TTS API request, so a stalled connection fails and is retried
     
     # Progress Settings
     PROGRESS_UPDATE_INTERVAL = 1.0
     TERMINAL_WIDTH = 120
+    MIN_REDRAW_INTERVAL = 0.1  # Seconds between unforced status redraws
     
     # Multiprocessing Settings
     MAX_PARALLEL_CHUNKS = 4  # Maximum number of chunks to process simultaneously
@@ -46,6 +71,11 @@ class Config:
     DEFAULT_PREFIX = "audio"  # Default prefix for chunk files
     TEMP_FILE_PREFIX = 'temp_chunk_'  # Legacy prefix - will be replaced with custom naming
     CHUNK_BOUNDARIES_SUFFIX = '_chunk_boundaries.json'
+    AUDIO_CACHE_DIR = "tts_audio_cache"  # Synthesized chunks keyed by text/language/speed
+    AUDIO_CACHE_ENABLED = True
+    AUDIO_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Least recently used chunks beyond this are pruned
+    MIN_BOUNDARY_CACHE_CHARS = 65536  # Smaller texts are rechunked each run instead of cached
+    _ensured_dirs = set()  # Output directories already created/verified this run
     
     # Display Elements
     PROGRESS_EMOJI = '🎵'
@@ -63,38 +93,36 @@ class Config:
     @staticmethod
     def get_absolute_path(relative_path):
         """Convert a relative path to an absolute path based on the project directory."""
-        if os.path.isabs(relative_path):
-            return relative_path
-        return os.path.join(Config.BASE_DIR, relative_path)
+        return _absolute_path(relative_path, Config.BASE_DIR)
     
     @staticmethod
     def get_default_output_dir():
         """Get the absolute path to the default output directory."""
-        return os.path.join(Config.BASE_DIR, Config.DEFAULT_OUTPUT_DIR)
+        return _absolute_path(Config.DEFAULT_OUTPUT_DIR, Config.BASE_DIR)
     
     @staticmethod
     def get_temp_filename(chunk_index, output_dir=None, prefix=None):
         """Get the temporary filename for a chunk, optionally in an output directory with custom prefix."""
         # Use custom prefix if provided, otherwise use default
-        file_prefix = prefix or Config.DEFAULT_PREFIX
-        
-        # Format: prefix + " " + number + .mp3  (e.g., "book audio 1.mp3")
-        filename = f"{file_prefix} {chunk_index + 1}.mp3"
+        return _temp_filename(chunk_index, output_dir, prefix or Config.DEFAULT_PREFIX, Config.BASE_DIR)
         
-        if output_dir:
-            # Make sure output_dir is absolute
-            abs_output_dir = Config.get_absolute_path(output_dir) if not os.path.isabs(output_dir) else output_dir
-            return os.path.join(abs_output_dir, filename)
-        return filename
-        
-    @staticmethod
-    def ensure_output_dir(output_dir=None):
+    @classmethod
+    def ensure_output_dir(cls, output_dir=None):
         """Ensure the output directory exists, create if it doesn't."""
         if not output_dir:
-            dir_path = Config.get_default_output_dir()
+            dir_path = cls.get_default_output_dir()
         else:
             # If output_dir is not absolute, make it relative to the project directory
-            dir_path = Config.get_absolute_path(output_dir) if not os.path.isabs(output_dir) else output_dir
-            
+            dir_path = cls.get_absolute_path(output_dir) if not os.path.isabs(output_dir) else output_dir
+        
+        # Skip the mkdir syscall for directories already ensured in this process
+        if dir_path in cls._ensured_dirs:
+            return dir_path
         os.makedirs(dir_path, exist_ok=True)
+        cls._ensured_dirs.add(dir_path)
         return dir_path
+    
+    @classmethod
+    def forget_output_dir(cls, dir_path):
+        """Forget that a directory was ensured, e.g. after removing it."""
+        cls._ensured_dirs.discard(dir_path)
@@ -3,10 +3,39 @@
 File management functionality for the TTS converter.
 """
 import os
-import glob
 import sys
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from .config import Config
 
+# Package and project root directories, computed once at import
+_TTS_CONVERTER_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.normpath(os.path.dirname(_TTS_CONVERTER_DIR))
+_PROJECT_ROOT_PREFIX = _PROJECT_ROOT + os.sep
+
+# Directories never descended into when searching for text files. They hold
+# tools, caches, dependencies or generated audio - never user .txt input - and
+# can contain tens of thousands of entries. Any hidden (dot) directory is
+# skipped as well.
+_SKIP_DIRS = frozenset({
+    'venv', 'env',                   # Virtual environments
+    '__pycache__',                   # Python cache
+    'node_modules',                  # Node.js
+    'build', 'dist',                 # Build directories
+    'site-packages',                 # Python packages
+    Config.DEFAULT_OUTPUT_DIR,       # Generated audio
+})
+
+# Name fragments marking clearly system/package .txt files
+_SYSTEM_NAME_PATTERNS = ('license', 'readme', 'changelog', 'authors', 'contributors',
+                         'requirements', 'setup', 'manifest', 'entry_points', 'top_level')
+
+# Last scan per root: (((directory, st_mtime_ns), ...), file paths). A directory's
+# mtime changes whenever an entry is added, removed or renamed in it, so
+# re-statting the scanned directories is enough to validate the list of paths.
+# Rewriting a file leaves its directory's mtime alone, so sizes are not cached.
+_FILES_CACHE = {}
+
 class FileManager:
     """Handles file discovery and selection."""
     
@@ -15,42 +44,116 @@ class FileManager:
         """Find all .txt files in the TTS project folder and its subdirectories.
         
         Excludes system directories like .venv, .git, __pycache__, node_modules, etc.
-        to focus on user-created text files only.
+        to focus on user-created text files only. Returns a sorted list of
+        (path, size_in_bytes) tuples; size is None if the file could not be stat'ed.
+        """
+        project_root = _PROJECT_ROOT
+        
+        # Reuse the previous scan if none of the scanned directories changed
+        cached = _FILES_CACHE.get(project_root)
+        if cached is not None:
+            dir_mtimes, paths = cached
+            try:
+                if all(os.stat(d).st_mtime_ns == mtime for d, mtime in dir_mtimes):
+                    return [(path, FileManager._file_size(path)) for path in paths]
+            except OSError:
+                pass  # A scanned directory disappeared; rescan
+        
+        # Find all .txt files in the project root, then walk each top-level
+        # subtree; directory listing is I/O bound, so subtrees run in parallel
+        scanned_dirs = []
+        try:
+            scanned_dirs.append((project_root, os.stat(project_root).st_mtime_ns))
+            files, subdirs = FileManager._list_directory(project_root)
+        except OSError:
+            files, subdirs = [], []
+        
+        if len(subdirs) <= 1:
+            for subdir in subdirs:
+                files.extend(FileManager._scan_text_files(subdir, scanned_dirs))
+        else:
+            with ThreadPoolExecutor(max_workers=min(Config.MAX_PARALLEL_CHUNKS, len(subdirs))) as pool:
+                for sub_files, sub_dirs in pool.map(FileManager._scan_subtree, subdirs):
+                    files.extend(sub_files)
+                    scanned_dirs.extend(sub_dirs)
+        
+        files.sort()
+        _FILES_CACHE[project_root] = (tuple(scanned_dirs), tuple(path for path, _ in files))
+        return files
+    
+    @staticmethod
+    def _file_size(path):
+        """Current size of a file in bytes, or None if it can't be stat'ed."""
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return None
+    
+    @staticmethod
+    def invalidate_cache():
+        """Forget cached text file scans so the next search walks the tree again."""
+        _FILES_CACHE.clear()
+    
+    @staticmethod
+    def _list_directory(path):
+        """Scan one directory and return (text files as (path, size), subdirectories to descend into).
+        
+        DirEntry caches the file type from the directory listing and its stat
+        result on first use, so each match costs at most one stat call.
+        Raises OSError if the directory itself can't be listed.
         """
-        # Get the directory where the tts_converter package is located
-        tts_converter_dir = os.path.dirname(os.path.abspath(__file__))
-        # Go up one level to get the project root directory
-        project_root = os.path.dirname(tts_converter_dir)
-        
-        # Directories to exclude from search (common system/build directories)
-        excluded_dirs = {
-            '.venv', 'venv', '.env', 'env',  # Virtual environments
-            '.git', '.svn', '.hg',           # Version control
-            '__pycache__', '.pytest_cache',  # Python cache
-            'node_modules', '.npm',          # Node.js
-            '.idea', '.vscode',              # IDEs
-            'build', 'dist', '.build',       # Build directories
-            '.tox', '.coverage',             # Testing/coverage
-            'site-packages'                  # Python packages
-        }
-        
-        # Find all .txt files in the project root and subdirectories
         files = []
-        for root, dirs, filenames in os.walk(project_root):
-            # Remove excluded directories from the search path
-            # This modifies dirs in-place to prevent os.walk from entering them
-            dirs[:] = [d for d in dirs if d not in excluded_dirs]
-            
-            for filename in filenames:
-                if filename.endswith('.txt'):
+        subdirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    # Prune skipped and hidden directories and, like os.walk, don't follow symlinks
+                    if name not in _SKIP_DIRS and name[0] != '.' and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif name.endswith('.txt'):
                     # Additional filter: exclude files that are clearly system/package files
                     # by checking for common patterns in their names
-                    if not any(pattern in filename.lower() for pattern in 
-                              ['license', 'readme', 'changelog', 'authors', 'contributors',
-                               'requirements', 'setup', 'manifest', 'entry_points', 'top_level']):
-                        files.append(os.path.join(root, filename))
+                    lower_name = name.lower()
+                    if not any(pattern in lower_name for pattern in _SYSTEM_NAME_PATTERNS):
+                        try:
+                            size = entry.stat().st_size
+                        except OSError:
+                            size = None  # Broken symlink or removed mid-scan
+                        files.append((entry.path, size))
+        return files, subdirs
+    
+    @staticmethod
+    def _scan_text_files(root, scanned_dirs=None):
+        """Yield (path, size) for user .txt files below root.
         
-        return sorted(files)
+        Walks with an explicit stack, so deep trees can't hit the recursion
+        limit. Each scanned directory and its mtime are appended to
+        scanned_dirs when given.
+        """
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            try:
+                if scanned_dirs is not None:
+                    scanned_dirs.append((path, os.stat(path).st_mtime_ns))
+                files, subdirs = FileManager._list_directory(path)
+            except OSError:
+                # Unreadable directory (permissions, removed while scanning)
+                continue
+            stack.extend(subdirs)
+            yield from files
+    
+    @staticmethod
+    def _scan_subtree(root):
+        """Scan one subtree in a worker thread; returns (files, scanned_dirs)."""
+        scanned_dirs = []
+        files = list(FileManager._scan_text_files(root, scanned_dirs))
+        return files, scanned_dirs
     
     @staticmethod
     def interactive_file_selection():
@@ -81,28 +184,28 @@ class FileManager:
             else:
                 return None
         
-        # Get the project root directory for relative path display
-        tts_converter_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(tts_converter_dir)
+        # Files found by the walk are anchored on the project root, so a plain
+        # prefix strip gives the relative path without abspath/getcwd per file
+        root_prefix = _PROJECT_ROOT_PREFIX
+        prefix_len = len(root_prefix)
         
         print(f"\n📁 Found {len(files)} .txt file(s) in TTS project folder and subdirectories:")
         print("----------------------------------------------------------------------")
         
-        for i, file_path in enumerate(files, 1):
-            try:
-                file_size = os.path.getsize(file_path) / 1024
-                
-                # Show path relative to project root for better readability
-                try:
-                    rel_path = os.path.relpath(file_path, project_root)
-                    display_name = rel_path
-                except:
-                    display_name = file_path
-                
-                # Match the exact format from the v3 file with proper spacing
-                print(f"{i:2d}. {display_name:<45} ({file_size:6.1f}KB)")
-            except OSError:
-                print(f"{i:2d}. {file_path:<45} (Error reading)")
+        # Build the whole listing first and write it in one call
+        lines = []
+        row_format = "{:2d}. {:<45} ({:6.1f}KB)".format
+        for i, (file_path, size_bytes) in enumerate(files, 1):
+            if size_bytes is None:
+                lines.append(f"{i:2d}. {file_path:<45} (Error reading)")
+                continue
+            
+            # Show path relative to project root for better readability
+            display_name = file_path[prefix_len:] if file_path.startswith(root_prefix) else file_path
+            
+            # Match the exact format from the v3 file with proper spacing
+            lines.append(row_format(i, display_name, size_bytes / 1024))
+        sys.stdout.write('\n'.join(lines) + '\n')
         
         print(f"{len(files) + 1:2d}. 📂 Enter custom file path")
         print(f"{len(files) + 2:2d}. ❌ Exit")
@@ -133,7 +236,7 @@ class FileManager:
                     choice_num = int(choice)
                     
                     if 1 <= choice_num <= len(files):
-                        selected = files[choice_num - 1]
+                        selected = files[choice_num - 1][0]
                         # Return the selection immediately without confirmation
                         return selected
                     
@@ -205,9 +308,14 @@ class FileManager:
             if custom_path.startswith('~'):
                 custom_path = os.path.expanduser(custom_path)
             
-            # Check if file exists
-            if os.path.exists(custom_path):
-                if os.path.isfile(custom_path):
+            # Check if file exists - one stat answers both "exists" and "is a file"
+            try:
+                st = os.stat(custom_path)
+            except OSError:
+                st = None
+            
+            if st is not None:
+                if stat.S_ISREG(st.st_mode):
                     # Check if it's a text file
                     if not custom_path.lower().endswith('.txt'):
                         print(f"⚠️ '{custom_path}' is not a .txt file. Are you sure you want to use it? (y/n): ", end='')
@@ -224,7 +332,7 @@ class FileManager:
                 print(f"❌ File '{custom_path}' not found!")
                 # Check if the directory exists at least
                 dir_path = os.path.dirname(custom_path)
-                if dir_path and not os.path.exists(dir_path):
+                if dir_path and not os.path.isdir(dir_path):
                     print(f"⚠️ Directory '{dir_path}' does not exist either.")
                 
                 print("")  # Add an empty line
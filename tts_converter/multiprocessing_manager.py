@@ -3,10 +3,41 @@
 Multiprocessing manager for parallel TTS conversion.
 """
 import os
+import re
+import sys
 import time
+import base64
+import shutil
+import hashlib
+import bisect
 import threading
-import queue
+from collections import deque
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from .config import Config
+from .progress import _format_seconds
+from .utils import TTSUtils
+
+
+# Buffer size for chunk mp3 writes; most chunks then go out in a single write()
+_WRITE_BUFFER_SIZE = 1 << 16
+
+# Per-chunk states stored in MultiprocessingManager.chunk_state, one byte per chunk
+_PENDING, _ACTIVE, _DONE, _FAILED = 0, 1, 2, 3
+
+# Marker and payload pattern of the audio line in a TTS API response (as parsed by gTTS)
+_AUDIO_MARKER = "jQ1olc"
+_AUDIO_RE = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+# gTTS releases whose private _prepare_requests() and response format the fast
+# path below mirrors: [2.2, 3.0). Other versions use gTTS's public write_to_fp().
+_FAST_PATH_GTTS_VERSIONS = ((2, 2), (3, 0))
+
+
+def _gtts_version(version_string):
+    """Parse the leading (major, minor) of a gTTS version string, or None."""
+    match = re.match(r'(\d+)\.(\d+)', version_string or '')
+    return (int(match.group(1)), int(match.group(2))) if match else None
 
 
 class MultiprocessingManager:
@@ -17,10 +48,17 @@ class MultiprocessingManager:
         self.active_chunks = {}  # Track currently processing chunks
         self.completed_chunks = set()  # Track completed chunks
         self.failed_chunks = set()  # Track failed chunks
-        self.display_lock = threading.Lock()
+        self.chunk_state = bytearray()  # One state byte per chunk, for scans in the display
+        self._completed_sorted = []  # completed_chunks / active_chunks indexes kept in order,
+        self._active_sorted = []     # so the display never re-sorts them
+        self._completed_line_cache = {}  # chunk index -> its "completed" line, formatted once
+        self._display_lines = []  # Reused by _rebuild_static_display for every frame
+        self.display_lock = threading.RLock()
+        self._event_cv = threading.Condition()  # Signalled when chunks start/finish or a worker exits
         self.shutdown_event = threading.Event()
         self.stop_new_chunks = threading.Event()  # Flag to stop starting new chunks but let current ones finish
         self.display_lines_count = 0  # Track how many lines we've displayed
+        self._is_tty = sys.stdout.isatty()  # Live display only on a terminal; plain lines otherwise
         self.last_display_update = 0  # Track last update time to avoid spam
         self._current_session_str = "0s"  # Current timing strings
         self._current_total_str = "0s"
@@ -35,20 +73,43 @@ class MultiprocessingManager:
         self.processing_lines_shown = set()  # Track which processing chunks we've already shown
         self.last_completed_chunks = set()  # Track completed chunks from last display update
         
+        # Chunks not yet started, in index order; every worker takes from the front
+        self._pending = deque()
+        
+        # gTTS splits each chunk into many short API requests and sends them one
+        # by one, each on a fresh HTTP session. A shared pool sends the parts
+        # of all active chunks concurrently over per-thread keep-alive sessions.
+        self._request_pool = None
+        self._http = threading.local()
+        
+        # gTTS and its HTTP client, imported once per run by _load_tts_backend
+        self._gTTS = None
+        self._gTTSError = None
+        self._requests = None
+        self._fast_path = False  # Whether this gTTS version supports the private-API fast path
+        
     def process_chunks_parallel(self, chunks, start_index, output_dir, language, slow, prefix, 
                               progress_tracker, checkpoint_mgr, shutdown_handler, file_path, 
                               initial_temp_files=None):
         """Process chunks in parallel with live progress display."""
+        self.reset()
+        self._is_tty = sys.stdout.isatty()
         
         # Store initial state for proper progress tracking
         self.initial_completed_count = start_index
         self.initial_temp_files = initial_temp_files or []
         
-        # Setup chunk processing queue
-        chunk_queue = queue.Queue()
-        results_queue = queue.Queue()
+        # Setup the shared chunk queue and the results queue. Both are plain
+        # deques: append/popleft are atomic, so neither side takes a lock.
+        results_queue = deque()
+        num_workers = max(min(self.max_workers, len(chunks) - start_index), 0)
+        self._pending = deque()
+        temp_files = []  # Chunk files finished this session, filled by the display thread
+        self.chunk_state = bytearray(len(chunks))
         
-        # Populate queue with remaining chunks
+        # Queue the remaining chunks in index order. Handing them out strictly
+        # first-in-first-out means a graceful stop (which lets active chunks
+        # finish) always leaves a contiguous completed prefix to resume from.
         for i in range(start_index, len(chunks)):
             chunk_info = {
                 'index': i,
@@ -57,16 +118,31 @@ class MultiprocessingManager:
                 'language': language,
                 'slow': slow,
                 'prefix': prefix,
-                'total_chunks': len(chunks)
+                'total_chunks': len(chunks),
+                # Output path computed once; used by the worker and the result handler
+                'temp_file': os.path.join(output_dir, f"{prefix} {i + 1}.mp3" if prefix
+                                          else f"{Config.TEMP_FILE_PREFIX}{i + 1}.mp3")
             }
-            chunk_queue.put(chunk_info)
+            self._pending.append(chunk_info)
+        
+        # Resolve the TTS library once here rather than on every chunk
+        self._load_tts_backend()
+        
+        # Pool for the individual TTS API requests, several in flight per worker
+        # (its threads are joined at exit; REQUEST_TIMEOUT bounds how long that can take)
+        self._request_pool = ThreadPoolExecutor(max_workers=self.max_workers * 4)
         
-        # Start worker threads (using threads instead of processes for better control)
+        # Initial display setup - show first 4 chunks as "processing". Done before
+        # any thread starts, so seeding the shared display state needs no lock.
+        self._show_initial_display(progress_tracker, len(chunks), start_index)
+        
+        # Start worker threads (using threads instead of processes for better control).
+        # Daemon threads, so a request stalled at exit can't keep the process alive.
         workers = []
-        for _ in range(min(self.max_workers, chunk_queue.qsize())):
+        for _ in range(num_workers):
             worker = threading.Thread(
                 target=self._worker_thread,
-                args=(chunk_queue, results_queue, shutdown_handler)
+                args=(results_queue, shutdown_handler)
             )
             worker.daemon = True
             worker.start()
@@ -75,214 +151,377 @@ class MultiprocessingManager:
         # Start display updater thread
         display_thread = threading.Thread(
             target=self._display_updater,
-            args=(results_queue, progress_tracker, checkpoint_mgr, file_path, chunks, output_dir, language, slow, prefix)
+            args=(results_queue, temp_files, progress_tracker, checkpoint_mgr, file_path, chunks, 
+                  output_dir, language, slow, prefix)
         )
         display_thread.daemon = True
         display_thread.start()
         
-        # Initial display setup - show first 4 chunks as "processing"
-        self._show_initial_display(progress_tracker, len(chunks), start_index)
+        # Forward stop requests to the workers while the main thread waits on them
+        workers_done = threading.Event()
+        stop_forwarder = threading.Thread(
+            target=self._forward_stop_requests,
+            args=(shutdown_handler, workers_done)
+        )
+        stop_forwarder.daemon = True
+        stop_forwarder.start()
         
-        # Monitor completion
-        total_to_process = len(chunks) - start_index
-        stop_message_shown = False
+        # Workers exit once the queue runs dry or a stop is requested
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            # Treat Ctrl+C like a normal stop, not force stop
+            print(f"\n{Config.STOP_EMOJI} Stop requested via Ctrl+C")
+            self.stop_new_chunks.set()
+            for worker in workers:
+                worker.join(timeout=5.0)
+        workers_done.set()
         
-        while not self.shutdown_event.is_set():
-            if not shutdown_handler.should_continue():
-                # Stop requested - set flag to prevent new chunks but let current ones finish
-                if not self.stop_new_chunks.is_set():
-                    self.stop_new_chunks.set()
-                    if not stop_message_shown:
-                        active_count = len(self.active_chunks)
-                        if active_count > 0:
-                            print(f"\n{Config.STOP_EMOJI} Stop requested. Allowing {active_count} active chunks to finish...")
-                        stop_message_shown = True
-                
-                # Check if all active chunks have completed
-                if len(self.active_chunks) == 0:
-                    # All active chunks completed, now we can exit
-                    self.shutdown_event.set()
-                    break
-                
-            try:
-                # Check completion status
-                total_completed_this_session = len(self.completed_chunks)
-                total_completed_overall = self.initial_completed_count + total_completed_this_session
-                total_processed = total_completed_this_session + len(self.failed_chunks)
-                remaining_chunks = len(chunks) - total_completed_overall
-                
-                # Check if we're done
-                if remaining_chunks <= 0 or total_processed >= total_to_process:
-                    break
-                
-                # Check if all workers are done and no more work
-                if all(not worker.is_alive() for worker in workers) and chunk_queue.empty():
-                    break
-                    
-                time.sleep(0.1)
-            except KeyboardInterrupt:
-                # Treat Ctrl+C like a normal stop, not force stop
-                print(f"\n{Config.STOP_EMOJI} Stop requested via Ctrl+C")
-                self.stop_new_chunks.set()
-                break
+        # Let the display thread drain the last results and draw the final frame
+        self.shutdown_event.set()
+        self._notify_progress()
+        display_thread.join(timeout=5.0)
         
-        # Wait for all workers to finish
-        for worker in workers:
-            worker.join(timeout=5.0)
+        # Make sure buffered saves are on disk, even if the display thread is stuck
+        checkpoint_mgr.flush()
         
-        # Wait for display thread to finish
-        display_thread.join(timeout=2.0)
+        self._request_pool.shutdown(wait=False)
+        self._request_pool = None
         
         return len(self.completed_chunks), self.failed_chunks
     
-    def _worker_thread(self, chunk_queue, results_queue, shutdown_handler):
+    def _forward_stop_requests(self, shutdown_handler, workers_done):
+        """Turn a user stop request into stop_new_chunks so workers finish their current chunk."""
+        while not workers_done.wait(1.0):
+            if not shutdown_handler.should_continue():
+                # Stop requested - set flag to prevent new chunks but let current ones finish
+                self.stop_new_chunks.set()
+                active_count = len(self.active_chunks)
+                if active_count > 0:
+                    print(f"\n{Config.STOP_EMOJI} Stop requested. Allowing {active_count} active chunks to finish...")
+                self._notify_progress()
+                return
+    
+    def _next_chunk(self):
+        """Take the lowest-index chunk not yet started, or None when all are taken."""
+        try:
+            return self._pending.popleft()  # Atomic, so workers never get the same chunk
+        except IndexError:
+            return None
+    
+    def _worker_thread(self, results_queue, shutdown_handler):
         """Worker thread to process individual chunks."""
         while not self.shutdown_event.is_set() and shutdown_handler.should_continue():
             # If stop was requested, don't start new chunks but let current ones finish
             if self.stop_new_chunks.is_set():
                 break
-                
-            try:
-                chunk_info = chunk_queue.get_nowait()
-            except queue.Empty:
+            
+            chunk_info = self._next_chunk()
+            if chunk_info is None:
                 break
             
             chunk_index = chunk_info['index']
             
-            # Mark chunk as active
+            # Mark chunk as active; the one monotonic reading also times the chunk
+            start = time.monotonic()
             with self.display_lock:
                 self.active_chunks[chunk_index] = {
-                    'start_time': time.time(),
+                    'start_time': start,
                     'info': chunk_info
                 }
+                self.chunk_state[chunk_index] = _ACTIVE
+                bisect.insort(self._active_sorted, chunk_index)
+            self._notify_progress()
             
             try:
                 # Process the chunk
-                success = self._process_single_chunk(chunk_info)
-                
-                # Report result
                 result = {
                     'index': chunk_index,
-                    'success': success,
-                    'info': chunk_info,
-                    'processing_time': time.time() - self.active_chunks[chunk_index]['start_time']
+                    'success': self._process_single_chunk(chunk_info),
+                    'info': chunk_info
                 }
-                results_queue.put(result)
-                
             except Exception as e:
                 # Report failure
                 result = {
                     'index': chunk_index,
                     'success': False,
                     'error': str(e),
-                    'info': chunk_info,
-                    'processing_time': time.time() - self.active_chunks[chunk_index]['start_time']
+                    'info': chunk_info
                 }
-                results_queue.put(result)
             
-            finally:
-                # Remove from active chunks
-                with self.display_lock:
-                    if chunk_index in self.active_chunks:
-                        del self.active_chunks[chunk_index]
+            # Report result
+            result['processing_time'] = time.monotonic() - start
+            results_queue.append(result)
             
-            chunk_queue.task_done()
+            # Remove from active chunks
+            with self.display_lock:
+                if chunk_index in self.active_chunks:
+                    del self.active_chunks[chunk_index]
+                    del self._active_sorted[bisect.bisect_left(self._active_sorted, chunk_index)]
+            self._notify_progress()
+        
+        # Let the monitor notice that this worker is done
+        self._notify_progress()
+    
+    def _notify_progress(self):
+        """Wake the monitor and display threads waiting for worker events."""
+        with self._event_cv:
+            self._event_cv.notify_all()
+    
+    def _wait_for_progress(self, timeout=1.0):
+        """Sleep until a worker event arrives or the timeout elapses."""
+        with self._event_cv:
+            self._event_cv.wait(timeout=timeout)
+    
+    def _load_tts_backend(self):
+        """Import gTTS lazily (it is checked/installed at startup) and keep the references."""
+        if self._gTTS is None:
+            import requests  # type: ignore
+            import gtts  # type: ignore
+            from gtts import gTTS  # type: ignore
+            from gtts.tts import gTTSError  # type: ignore
+            self._requests = requests
+            self._gTTSError = gTTSError
+            version = _gtts_version(getattr(gtts, '__version__', None))
+            low, high = _FAST_PATH_GTTS_VERSIONS
+            self._fast_path = (version is not None and low <= version < high
+                               and hasattr(gTTS, '_prepare_requests'))
+            if self._fast_path:
+                # The fast path sends with verify=False itself, so silence the
+                # per-request warning once, as gTTS's own stream() does
+                import urllib3  # type: ignore
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            self._gTTS = gTTS
+    
+    def synthesize(self, text, language, slow, path):
+        """Convert text to speech and write the mp3 to path (one attempt, no retries)."""
+        self._load_tts_backend()
+        tts = self._gTTS(text=text, lang=language, slow=slow)
+        self._save_speech(tts, path)
     
     def _process_single_chunk(self, chunk_info):
         """Process a single chunk (extracted for reusability)."""
-        from gtts import gTTS  # type: ignore
+        self._load_tts_backend()
         
-        index = chunk_info['index']
         text = chunk_info['text']
-        output_dir = chunk_info['output_dir']
         language = chunk_info['language']
         slow = chunk_info['slow']
-        prefix = chunk_info['prefix']
-        
-        # Generate filename
-        if prefix:
-            chunk_filename = f"{prefix} {index + 1}.mp3"
-        else:
-            chunk_filename = f"{Config.TEMP_FILE_PREFIX}{index + 1}.mp3"
-        
-        temp_file = os.path.join(output_dir, chunk_filename)
+        temp_file = chunk_info['temp_file']
         
         # Convert to speech with retry logic
         max_attempts = Config.MAX_RETRIES
         for attempt in range(max_attempts):
             try:
-                tts = gTTS(text=text, lang=language, slow=slow)
-                tts.save(temp_file)
+                self.synthesize(text, language, slow, temp_file)
                 return True
-            except Exception as e:
+            except self._gTTSError as e:
+                # Only API/network failures are worth retrying; anything else
+                # (bad language, unwritable output) would fail the same way again
                 if attempt == max_attempts - 1:
                     raise e
-                delay = Config.RETRY_DELAY * (2 ** attempt)
-                time.sleep(delay)
+                time.sleep(TTSUtils.retry_delay(attempt, e))
         
         return False
     
-    def _display_updater(self, results_queue, progress_tracker, checkpoint_mgr, file_path, 
+    @staticmethod
+    def _audio_cache_path(tts):
+        """Path of the cached mp3 for this request's text, language, speed and host."""
+        key = f"{tts.lang}|{getattr(tts, 'tld', '')}|{getattr(tts, 'speed', None)}|{tts.text}"
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=20).hexdigest()
+        return os.path.join(Config.get_absolute_path(Config.AUDIO_CACHE_DIR), f"{digest}.mp3")
+    
+    @staticmethod
+    def _unlink_if_exists(path):
+        """Remove a file, ignoring it if it is already gone."""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+    
+    @staticmethod
+    def _link_or_copy(src, dst):
+        """Hard-link src to dst, copying when linking isn't possible."""
+        MultiprocessingManager._unlink_if_exists(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)  # Different filesystem, or no hard links
+    
+    def _save_speech(self, tts, temp_file):
+        """Write the mp3 for a gTTS request, reusing a cached copy of identical audio."""
+        if not Config.AUDIO_CACHE_ENABLED:
+            self._synthesize_to_file(tts, temp_file)
+            return
+        
+        cache_path = self._audio_cache_path(tts)
+        if os.path.exists(cache_path):
+            try:
+                if os.path.getsize(cache_path) > 0:
+                    self._link_or_copy(cache_path, temp_file)  # Cache hit: no network request
+                    os.utime(cache_path)  # Recently used entries survive prune_audio_cache
+                    return
+                self._unlink_if_exists(cache_path)  # Empty entry: drop it and re-synthesize
+            except OSError:
+                pass  # Unusable cache entry: synthesize instead
+        
+        self._synthesize_to_file(tts, temp_file)
+        
+        # The chunk is done; failing to cache it must not fail the chunk
+        try:
+            if os.path.getsize(temp_file) == 0:
+                return  # Never cache empty audio
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            os.link(temp_file, cache_path)  # Atomic; another worker may have cached it first
+        except FileExistsError:
+            pass
+        except OSError:
+            # No hard links here: copy under a temporary name, then swap in atomically
+            partial = f"{cache_path}.{threading.get_ident()}.tmp"
+            try:
+                shutil.copyfile(temp_file, partial)
+                os.replace(partial, cache_path)
+            except OSError:
+                try:
+                    self._unlink_if_exists(partial)
+                except OSError:
+                    pass
+    
+    @staticmethod
+    def prune_audio_cache(max_bytes=None):
+        """Delete least recently used cached chunks until the cache fits in max_bytes."""
+        max_bytes = Config.AUDIO_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        entries = []
+        try:
+            with os.scandir(Config.get_absolute_path(Config.AUDIO_CACHE_DIR)) as it:
+                for entry in it:
+                    if entry.name.endswith('.mp3') and entry.is_file(follow_symlinks=False):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except FileNotFoundError:
+            return 0
+        
+        total = sum(size for _, size, _ in entries)
+        victims = []
+        for _, size, path in sorted(entries):  # Oldest first
+            if total <= max_bytes:
+                break
+            victims.append(path)
+            total -= size
+        failures = TTSUtils.remove_files(victims)
+        return len(victims) - len(failures)
+    
+    @staticmethod
+    def clear_audio_cache():
+        """Delete every cached chunk; returns how many were removed."""
+        return MultiprocessingManager.prune_audio_cache(max_bytes=0)
+    
+    def _synthesize_to_file(self, tts, temp_file):
+        """Fetch all API parts of a gTTS request concurrently and write the mp3."""
+        # temp_file may be a hard link into the audio cache left by an earlier run;
+        # writing through it would overwrite that cached audio, so start a new file
+        self._unlink_if_exists(temp_file)
+        
+        if not self._fast_path:
+            # gTTS version outside the verified range: let it do the requests itself
+            with open(temp_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                tts.write_to_fp(f)
+            return
+        
+        # Fast path (gTTS internals): gTTS's own prepared requests, sent concurrently
+        # over keep-alive sessions and parsed the way gTTS parses them
+        prepare = tts._prepare_requests
+        fetch = lambda request: self._fetch_speech_part(tts, request)
+        pool = self._request_pool
+        if pool is not None:
+            audio_parts = list(pool.map(fetch, prepare()))
+        else:
+            # Sequential mode: one part at a time, still over the keep-alive session
+            audio_parts = [fetch(request) for request in prepare()]
+        with open(temp_file, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.writelines(audio_parts)
+    
+    def _fetch_speech_part(self, tts, prepared_request):
+        """Send one prepared TTS API request on this thread's keep-alive session."""
+        requests = self._requests
+        gTTSError = self._gTTSError
+        
+        session = getattr(self._http, 'session', None)
+        if session is None:
+            session = self._http.session = requests.Session()
+        
+        # Same transport options gTTS uses for its own requests, plus a default
+        # timeout so a stalled connection can't block a worker (or exit) forever
+        try:
+            response = session.send(prepared_request, verify=False,
+                                    proxies=urllib.request.getproxies(),
+                                    timeout=getattr(tts, 'timeout', None) or Config.REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            raise gTTSError(tts=tts, response=response)
+        except requests.exceptions.RequestException:
+            raise gTTSError(tts=tts)
+        
+        audio = []
+        for line in response.iter_lines(chunk_size=1024):
+            decoded_line = line.decode('utf-8')
+            if _AUDIO_MARKER in decoded_line:
+                match = _AUDIO_RE.search(decoded_line)
+                if not match:
+                    # Good response, but no audio stream in it
+                    raise gTTSError(tts=tts, response=response)
+                audio.append(base64.b64decode(match.group(1).encode('ascii')))
+        return b''.join(audio)
+    
+    def _display_updater(self, results_queue, temp_files, progress_tracker, checkpoint_mgr, file_path, 
                         chunks, output_dir, language, slow, prefix):
         """Update display with parallel processing progress."""
-        temp_files = []
         total_chunks = len(chunks)
-        last_display_time = 0
-        display_interval = 1.0  # Update timing every 1 second
         
-        while not self.shutdown_event.is_set():
+        while True:
+            # Set only after every worker has exited, so this pass drains the last results
+            workers_finished = self.shutdown_event.is_set()
             try:
-                # Process any completed chunks
-                chunk_completed = False
-                new_completions = set()
-                while True:
-                    try:
-                        result = results_queue.get_nowait()
+                # Take the display lock once for the whole drain-and-render pass;
+                # the render helpers below run under it
+                with self.display_lock:
+                    # Process any completed chunks
+                    new_completions = set()
+                    # Drain everything queued so far in one pass
+                    batch = [results_queue.popleft() for _ in range(len(results_queue))]
+                    for result in batch:
                         self._handle_chunk_result(result, temp_files, progress_tracker, 
                                                 checkpoint_mgr, file_path, chunks, output_dir, 
                                                 language, slow, prefix)
                         if result['success']:
                             new_completions.add(result['index'])
-                        chunk_completed = True
-                    except queue.Empty:
-                        break
-                
-                # Only rebuild display if there are actual new completions
-                if new_completions:
-                    # Add new completion messages without overwriting existing ones
-                    self._add_completion_messages(new_completions, total_chunks, progress_tracker)
-                    # Track that we've shown these completions
-                    self.last_completed_chunks.update(new_completions)
-                elif chunk_completed:
-                    # Just update timing for processing chunks without rebuilding completion messages
-                    self._update_processing_timing(progress_tracker, total_chunks)
-                else:
-                    # Just update timing values periodically without changing display structure
-                    current_time = time.time()
-                    if (current_time - last_display_time) >= display_interval:
+                    
+                    # Only rebuild display if there are actual new completions
+                    if new_completions:
+                        # Add new completion messages without overwriting existing ones
+                        self._add_completion_messages(new_completions, total_chunks, progress_tracker)
+                        # Track that we've shown these completions
+                        self.last_completed_chunks.update(new_completions)
+                    elif self._is_tty:
+                        # Just update timing values (at most once a second) without changing display
+                        # structure; piped output gets no timing refresh, only completion lines
                         self._update_parallel_display(progress_tracker, total_chunks)
-                        last_display_time = current_time
-                
-                # Check if we're done - continue until all chunks are processed or stopped
-                total_completed_this_session = len(self.completed_chunks)
-                total_completed_overall = self.initial_completed_count + total_completed_this_session
-                total_processed = total_completed_this_session + len(self.failed_chunks)
-                remaining_chunks = total_chunks - total_completed_overall
-                
-                # Exit conditions:
-                # 1. All chunks completed
-                # 2. Stop was requested AND no active chunks remaining
-                if (remaining_chunks <= 0 or total_completed_overall >= total_chunks or 
-                    (self.stop_new_chunks.is_set() and len(self.active_chunks) == 0)):
-                    # Final display update
-                    self._rebuild_static_display(progress_tracker, total_chunks)
-                    break
+                    
+                    # Done once the workers have exited - all chunks processed or stopped
+                    if workers_finished:
+                        # Final display update
+                        self._rebuild_static_display(progress_tracker, total_chunks)
+                        break
                 
-                time.sleep(0.1)  # Small sleep to prevent excessive CPU usage
+                # Sleep until a worker reports; the 1 s timeout doubles as the timing tick
+                self._wait_for_progress()
                 
             except Exception as e:
                 print(f"Display updater error: {e}")
                 break
+        
+        # Commit whatever the checkpoint manager is still buffering
+        checkpoint_mgr.flush()
     
     def _handle_chunk_result(self, result, temp_files, progress_tracker, checkpoint_mgr, 
                            file_path, chunks, output_dir, language, slow, prefix):
@@ -293,70 +532,76 @@ class MultiprocessingManager:
         
         if success:
             self.completed_chunks.add(index)
+            self.chunk_state[index] = _DONE
+            bisect.insort(self._completed_sorted, index)
+            self._completed_line_cache[index] = f"✅ Chunk {index + 1} completed"
             
-            # Generate filename for temp_files tracking
-            if prefix:
-                chunk_filename = f"{prefix} {index + 1}.mp3"
-            else:
-                chunk_filename = f"{Config.TEMP_FILE_PREFIX}{index + 1}.mp3"
-            
-            temp_file = os.path.join(output_dir, chunk_filename)
-            temp_files.append(temp_file)
+            temp_files.append(chunk_info['temp_file'])
             
-            # Save progress with correct total completed count
-            total_completed = self.initial_completed_count + len(self.completed_chunks)
-            all_temp_files = self.initial_temp_files + temp_files
-            output_file = os.path.join(output_dir, f"{prefix or 'output'}.mp3")
-            checkpoint_mgr.save_progress(
-                file_path,
-                len(chunks),
-                total_completed,
-                list(self.failed_chunks),
-                all_temp_files,
-                output_file,
-                language,
-                slow,
-                'in_progress',
-                prefix=prefix
-            )
+            # CheckpointManager batches the writes, so record every completion
+            self._save_checkpoint(temp_files, checkpoint_mgr, file_path, chunks, 
+                                  output_dir, language, slow, prefix)
         else:
             self.failed_chunks.add(index)
+            self.chunk_state[index] = _FAILED
             error = result.get('error', 'Unknown error')
             print(f"❌ Chunk {index + 1} failed: {error}")
     
+    def _save_checkpoint(self, temp_files, checkpoint_mgr, file_path, chunks, 
+                         output_dir, language, slow, prefix):
+        """Save in-progress state for all chunks completed so far."""
+        # Save progress with correct total completed count
+        total_completed = self.initial_completed_count + len(self.completed_chunks)
+        all_temp_files = self.initial_temp_files + temp_files
+        output_file = os.path.join(output_dir, f"{prefix or 'output'}.mp3")
+        checkpoint_mgr.save_progress(
+            file_path,
+            len(chunks),
+            total_completed,
+            list(self.failed_chunks),
+            all_temp_files,
+            output_file,
+            language,
+            slow,
+            'in_progress',
+            prefix=prefix
+        )
+    
     def _update_parallel_display(self, progress_tracker, total_chunks):
-        """Update only the timing values in the static display without creating new lines."""
+        """Update only the timing values in the static display without creating new lines.
+        
+        Called with display_lock held.
+        """
         current_time = time.time()
         
         # Limit update frequency to avoid spam
         if current_time - self.last_display_update < 1.0:  # Update every 1 second
             return
             
-        with self.display_lock:
-            self.last_display_update = current_time
-            
-            # Calculate timing info
-            session_elapsed = time.time() - progress_tracker._start_time if progress_tracker._start_time else 0
-            total_elapsed = session_elapsed + progress_tracker._previous_cumulative_time
-            
-            # Calculate ETA
-            completed_count = len(self.completed_chunks)
-            remaining_count = total_chunks - completed_count
-            
-            eta_str = "0s"
-            if completed_count > 0 and remaining_count > 0:
-                if session_elapsed > 0:
-                    avg_time_per_chunk = session_elapsed / completed_count
-                    estimated_remaining_time = avg_time_per_chunk * remaining_count
-                    eta_str = progress_tracker.format_time(estimated_remaining_time)
-            
-            session_str = progress_tracker.format_time(session_elapsed)
-            total_str = progress_tracker.format_time(total_elapsed)
-            
-            # Store the current values for when chunks complete and we need to rebuild display
-            self._current_session_str = session_str
-            self._current_total_str = total_str
-            self._current_eta_str = eta_str
+        self.last_display_update = current_time
+        
+        # Calculate timing info
+        session_elapsed = time.monotonic() - progress_tracker._start_time if progress_tracker._start_time else 0
+        total_elapsed = session_elapsed + progress_tracker._previous_cumulative_time
+        
+        # Calculate ETA from this session's completions
+        completed_count = len(self.completed_chunks)
+        remaining_count = total_chunks - self.initial_completed_count - completed_count
+        
+        eta_str = "0s"
+        if completed_count > 0 and remaining_count > 0:
+            if session_elapsed > 0:
+                avg_time_per_chunk = session_elapsed / completed_count
+                estimated_remaining_time = avg_time_per_chunk * remaining_count
+                eta_str = self._format_time(estimated_remaining_time)
+        
+        session_str = self._format_time(session_elapsed)
+        total_str = self._format_time(total_elapsed)
+        
+        # Store the current values for when chunks complete and we need to rebuild display
+        self._current_session_str = session_str
+        self._current_total_str = total_str
+        self._current_eta_str = eta_str
     
     def _show_initial_display(self, progress_tracker, total_chunks, start_index):
         """Show the initial static display with completed and processing chunks in order."""
@@ -375,11 +620,14 @@ class MultiprocessingManager:
         # First, show completed chunks from previous sessions (0 to start_index-1)
         for i in range(start_index):
             chunk_num = i + 1
-            display_lines.append(f"✅ Chunk {chunk_num} completed")
+            line = self._completed_line_cache[i] = f"✅ Chunk {chunk_num} completed"
+            display_lines.append(line)
             # Track that we've shown this completion
             self.completed_lines_shown.add(i)
-            # Add to completed chunks set (these were completed in previous sessions)
-            self.completed_chunks.add(i)
+            # Display them as completed; completed_chunks holds only this session's
+            # completions, previous ones are counted by initial_completed_count
+            self.chunk_state[i] = _DONE
+            self._completed_sorted.append(i)
             self.last_completed_chunks.add(i)
         
         # Then show the first few chunks that need processing (up to 4) in numerical order
@@ -395,198 +643,185 @@ class MultiprocessingManager:
             self.processing_lines_shown.add(i)
             chunks_displayed += 1
         
-        # Print initial static display - this will be rebuilt as chunks complete
-        print()  # Empty line before status
-        for line in display_lines:
-            print(line)
-        
-        print()  # Empty line
-        print("Input your command here: ", end="", flush=True)
+        # Print initial static display (after an empty line) - this will be rebuilt as chunks complete
+        if self._is_tty:
+            self._emit_frame(display_lines, prefix="\n")
         
         # Track line count for future operations
         self.display_lines_count = len(display_lines)
     
     def _rebuild_static_display(self, progress_tracker, total_chunks):
-        """Rebuild the entire static display when chunks complete."""
-        with self.display_lock:
-            # Calculate timing info
-            session_elapsed = time.time() - progress_tracker._start_time if progress_tracker._start_time else 0
-            total_elapsed = session_elapsed + progress_tracker._previous_cumulative_time
-            
-            # Calculate ETA - account for all completed chunks (including from previous sessions)
-            total_completed_count = len(self.completed_chunks)  # This includes previously completed chunks
-            remaining_count = total_chunks - total_completed_count
-            
-            eta_str = "0s"
-            # Only calculate ETA based on chunks completed in this session for accuracy
-            session_completed = total_completed_count - self.initial_completed_count
-            if session_completed > 0 and remaining_count > 0 and session_elapsed > 0:
-                avg_time_per_chunk = session_elapsed / session_completed
-                estimated_remaining_time = avg_time_per_chunk * remaining_count
-                eta_str = progress_tracker.format_time(estimated_remaining_time)
-            
-            session_str = progress_tracker.format_time(session_elapsed)
-            total_str = progress_tracker.format_time(total_elapsed)
-            
-            # Update stored values
-            self._current_session_str = session_str
-            self._current_total_str = total_str
-            self._current_eta_str = eta_str
-            
-            # Clear previous display if it exists
-            if self.display_lines_count > 0:
-                # Move cursor up to clear previous display
-                print(f"\033[{self.display_lines_count + 2}A", end="")
-                for _ in range(self.display_lines_count + 2):
-                    print("\033[2K\033[1B", end="")  # Clear line and move down
-                print(f"\033[{self.display_lines_count + 2}A", end="")  # Move back up
-            
-            # Build new display content with chunks in correct order
-            display_lines = []
-            max_lines = 8  # Show more lines to include both completed and processing
-            
-            # Show all completed chunks in order (up to a reasonable limit)
-            completed_list = sorted(self.completed_chunks)
-            lines_used = 0
-            
-            # Show completed chunks (but limit to avoid too much output)
-            if completed_list:
-                # If we have many completed chunks, show only the most recent ones
+        """Rebuild the entire static display when chunks complete. Called with display_lock held."""
+        if not self._is_tty:
+            return
+        
+        # Calculate timing info
+        session_elapsed = time.monotonic() - progress_tracker._start_time if progress_tracker._start_time else 0
+        total_elapsed = session_elapsed + progress_tracker._previous_cumulative_time
+        
+        # Calculate ETA - account for all completed chunks (including from previous sessions)
+        total_completed_count = self.initial_completed_count + len(self.completed_chunks)
+        remaining_count = total_chunks - total_completed_count
+        
+        eta_str = "0s"
+        # Only calculate ETA based on chunks completed in this session for accuracy
+        session_completed = total_completed_count - self.initial_completed_count
+        if session_completed > 0 and remaining_count > 0 and session_elapsed > 0:
+            avg_time_per_chunk = session_elapsed / session_completed
+            estimated_remaining_time = avg_time_per_chunk * remaining_count
+            eta_str = self._format_time(estimated_remaining_time)
+        
+        session_str = self._format_time(session_elapsed)
+        total_str = self._format_time(total_elapsed)
+        
+        # Update stored values
+        self._current_session_str = session_str
+        self._current_total_str = total_str
+        self._current_eta_str = eta_str
+        
+        # Build new display content with chunks in correct order
+        display_lines = self._display_lines
+        display_lines.clear()
+        max_lines = 8  # Show more lines to include both completed and processing
+        
+        # Show all completed chunks in order (up to a reasonable limit)
+        completed_list = self._completed_sorted
+        lines_used = 0
+        
+        # Show completed chunks (but limit to avoid too much output)
+        if completed_list:
+            # If we have many completed chunks, show only the most recent ones
+            if len(completed_list) > 4:
+                # Show first 2 and last 2 with dots in between if needed
+                for i in completed_list[:2]:
+                    display_lines.append(self._completed_line_cache[i])
+                    lines_used += 1
+                
                 if len(completed_list) > 4:
-                    # Show first 2 and last 2 with dots in between if needed
-                    for i in completed_list[:2]:
-                        chunk_num = i + 1
-                        display_lines.append(f"✅ Chunk {chunk_num} completed")
-                        lines_used += 1
-                    
-                    if len(completed_list) > 4:
-                        display_lines.append("... (other completed chunks)")
-                        lines_used += 1
-                    
-                    for i in completed_list[-2:]:
-                        if i not in completed_list[:2]:  # Avoid duplicates
-                            chunk_num = i + 1
-                            display_lines.append(f"✅ Chunk {chunk_num} completed")
-                            lines_used += 1
-                else:
-                    # Show all completed chunks
-                    for i in completed_list:
-                        chunk_num = i + 1
-                        display_lines.append(f"✅ Chunk {chunk_num} completed")
+                    display_lines.append("... (other completed chunks)")
+                    lines_used += 1
+                
+                for i in completed_list[-2:]:
+                    if i not in completed_list[:2]:  # Avoid duplicates
+                        display_lines.append(self._completed_line_cache[i])
                         lines_used += 1
-            
-            # Show currently processing chunks
-            active_list = sorted(self.active_chunks.keys())
-            for chunk_idx in active_list:
-                if lines_used >= max_lines:
-                    break
-                chunk_num = chunk_idx + 1
-                display_lines.append(f"📝 Processing chunk {chunk_num}/{total_chunks} | Session: {session_str} | Total: {total_str} | ETA: {eta_str}")
-                lines_used += 1
-            
-            # Show next few pending chunks (if there's room and they exist)
-            next_chunk_to_process = max(max(completed_list) if completed_list else -1, 
-                                      max(active_list) if active_list else -1) + 1
-            chunks_to_show = min(3, max_lines - lines_used)  # Show up to 3 upcoming chunks
-            
-            for i in range(next_chunk_to_process, min(next_chunk_to_process + chunks_to_show, total_chunks)):
-                if lines_used >= max_lines:
-                    break
-                chunk_num = i + 1
-                display_lines.append(f"📝 Processing chunk {chunk_num}/{total_chunks} | Session: {session_str} | Total: {total_str} | ETA: {eta_str}")
-                lines_used += 1
-            
-            # Print new static display
-            for line in display_lines:
-                print(line)
-            
-            print()  # Empty line
-            print("Input your command here: ", end="", flush=True)
-            
-            # Update line count for next operation
-            self.display_lines_count = len(display_lines)
+            else:
+                # Show all completed chunks
+                for i in completed_list:
+                    display_lines.append(self._completed_line_cache[i])
+                    lines_used += 1
+        
+        # Show currently processing chunks
+        active_list = self._active_sorted
+        for chunk_idx in active_list:
+            if lines_used >= max_lines:
+                break
+            chunk_num = chunk_idx + 1
+            display_lines.append(f"📝 Processing chunk {chunk_num}/{total_chunks} | Session: {session_str} | Total: {total_str} | ETA: {eta_str}")
+            lines_used += 1
+        
+        # Show next few pending chunks (if there's room and they exist)
+        next_chunk_to_process = max(completed_list[-1] if completed_list else -1, 
+                                  active_list[-1] if active_list else -1) + 1
+        chunks_to_show = min(3, max_lines - lines_used)  # Show up to 3 upcoming chunks
+        
+        for i in range(next_chunk_to_process, min(next_chunk_to_process + chunks_to_show, total_chunks)):
+            if lines_used >= max_lines:
+                break
+            chunk_num = i + 1
+            display_lines.append(f"📝 Processing chunk {chunk_num}/{total_chunks} | Session: {session_str} | Total: {total_str} | ETA: {eta_str}")
+            lines_used += 1
+        
+        # Clear the previous display, if any, by moving up over it and erasing
+        # everything below; the whole frame then goes out in a single write
+        clear = ""
+        if self.display_lines_count > 0:
+            clear = f"\033[{self.display_lines_count + 2}A\r\033[J"
+        self._emit_frame(display_lines, prefix=clear)
+        
+        # Update line count for next operation
+        self.display_lines_count = len(display_lines)
     
     def _add_completion_messages(self, new_completions, total_chunks, progress_tracker):
-        """Add completion messages for newly completed chunks without overwriting existing ones."""
-        with self.display_lock:
-            # Clear the input prompt line
-            print("\r\033[K", end="")  # Clear current line
-            print("\033[F\r\033[K", end="")  # Move up one line and clear it
-            
-            # Add completion messages for new chunks (in order)
-            for chunk_index in sorted(new_completions):
+        """Add completion messages for newly completed chunks without overwriting existing ones.
+        
+        Called with display_lock held.
+        """
+        # Add completion messages for new chunks (in order)
+        lines = []
+        for chunk_index in sorted(new_completions):
+            lines.append(self._completed_line_cache[chunk_index])
+        
+        if not self._is_tty:
+            # Not a terminal: just the completion lines, no prompt or status block
+            sys.stdout.write("".join(line + "\n" for line in lines))
+            sys.stdout.flush()
+            return
+        
+        # Calculate current timing for any processing status updates
+        session_elapsed = time.monotonic() - progress_tracker._start_time if progress_tracker._start_time else 0
+        total_elapsed = session_elapsed + progress_tracker._previous_cumulative_time
+        
+        session_str = self._format_time(session_elapsed)
+        total_str = self._format_time(total_elapsed)
+        
+        # Calculate ETA from this session's completions
+        completed_count = len(self.completed_chunks)
+        remaining_count = total_chunks - self.initial_completed_count - completed_count
+        eta_str = "0s"
+        if completed_count > 0 and remaining_count > 0 and session_elapsed > 0:
+            avg_time_per_chunk = session_elapsed / completed_count
+            estimated_remaining_time = avg_time_per_chunk * remaining_count
+            eta_str = self._format_time(estimated_remaining_time)
+        
+        # Show a few processing chunks that are currently active or next in line
+        active_list = self._active_sorted
+        
+        # Find next chunks to show as processing (bytearray.find scans in C)
+        next_chunks = []
+        i = self.chunk_state.find(_PENDING)
+        while i != -1 and len(next_chunks) < 3:  # Show up to 3 next chunks
+            next_chunks.append(i)
+            i = self.chunk_state.find(_PENDING, i + 1)
+        
+        # Combine active and next chunks
+        chunks_to_show = active_list[:3]  # Show up to 3 active
+        remaining_slots = 3 - len(chunks_to_show)
+        chunks_to_show.extend(next_chunks[:remaining_slots])
+        chunks_to_show.sort()
+        
+        # Display processing status for these chunks
+        for chunk_index in chunks_to_show:
+            if chunk_index < total_chunks:
                 chunk_num = chunk_index + 1
-                print(f"✅ Chunk {chunk_num} completed")
-            
-            # Calculate current timing for any processing status updates
-            session_elapsed = time.time() - progress_tracker._start_time if progress_tracker._start_time else 0
-            total_elapsed = session_elapsed + progress_tracker._previous_cumulative_time
-            
-            session_str = self._format_time(session_elapsed)
-            total_str = self._format_time(total_elapsed)
-            
-            # Calculate ETA
-            completed_count = len(self.completed_chunks)
-            remaining_count = total_chunks - completed_count
-            eta_str = "0s"
-            if completed_count > 0 and remaining_count > 0 and session_elapsed > 0:
-                avg_time_per_chunk = session_elapsed / completed_count
-                estimated_remaining_time = avg_time_per_chunk * remaining_count
-                eta_str = self._format_time(estimated_remaining_time)
-            
-            # Show a few processing chunks that are currently active or next in line
-            active_list = sorted(self.active_chunks.keys())
-            all_processed_or_active = self.completed_chunks | set(self.active_chunks.keys()) | self.failed_chunks
-            
-            # Find next chunks to show as processing
-            next_chunks = []
-            for i in range(total_chunks):
-                if i not in all_processed_or_active:
-                    next_chunks.append(i)
-                    if len(next_chunks) >= 3:  # Show up to 3 next chunks
-                        break
-            
-            # Combine active and next chunks
-            chunks_to_show = active_list[:3]  # Show up to 3 active
-            remaining_slots = 3 - len(chunks_to_show)
-            chunks_to_show.extend(next_chunks[:remaining_slots])
-            chunks_to_show.sort()
-            
-            # Display processing status for these chunks
-            for chunk_index in chunks_to_show:
-                if chunk_index < total_chunks:
-                    chunk_num = chunk_index + 1
-                    print(f"📝 Processing chunk {chunk_num}/{total_chunks} | Session: {session_str} | Total: {total_str} | ETA: {eta_str}")
-            
-            # Restore input prompt
-            print()  # Empty line
-            print("Input your command here: ", end="", flush=True)
+                lines.append(f"📝 Processing chunk {chunk_num}/{total_chunks} | Session: {session_str} | Total: {total_str} | ETA: {eta_str}")
+        
+        # Clear the input prompt line and the empty line above it, then restore the prompt below
+        self._emit_frame(lines, prefix="\r\033[K\033[F\r\033[K")
+    
+    def _emit_frame(self, lines, prefix=""):
+        """Write display lines plus the input prompt to the terminal in one write."""
+        frame = prefix + "".join(line + "\n" for line in lines) + "\nInput your command here: "
+        # Under display_lock so a frame never interleaves with another thread's output
+        with self.display_lock:
+            sys.stdout.write(frame)
+            sys.stdout.flush()
     
     def _format_time(self, seconds):
         """Format time in a human-readable way."""
-        if seconds < 60:
-            return f"{int(seconds)}s"
-        elif seconds < 3600:
-            minutes = int(seconds // 60)
-            secs = int(seconds % 60)
-            return f"{minutes}m {secs}s"
-        else:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
+        # Whole seconds is the display resolution, so the cache key loses nothing
+        return _format_seconds(int(seconds))
     
-    def _update_processing_timing(self, progress_tracker, total_chunks):
-        """Update timing information for processing chunks without rebuilding completion messages."""
-        # For now, just do a minimal update - we could enhance this to update only timing
-        # without touching completion messages, but this prevents unnecessary rebuilds
-        pass
-        
     def reset(self):
         """Reset the manager state for a new processing session."""
         self.shutdown_event.clear()
         self.stop_new_chunks.clear()
         self.completed_chunks.clear()
         self.failed_chunks.clear()
+        self.chunk_state = bytearray()
+        self._completed_sorted = []
+        self._active_sorted = []
+        self._completed_line_cache.clear()
         self.active_chunks.clear()
         self.display_lines_count = 0
         self.last_display_update = 0
@@ -596,3 +831,4 @@ class MultiprocessingManager:
         self.completed_lines_shown.clear()
         self.processing_lines_shown.clear()
         self.last_completed_chunks.clear()
+        self._pending.clear()
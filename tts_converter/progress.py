@@ -2,9 +2,55 @@
 """
 Progress tracking functionality for the TTS converter.
 """
+import sys
 import time
+import queue
 import threading
+from functools import lru_cache
 from .config import Config
+from .utils import _CLEAR_LINE
+
+
+# Status frames: clear the prompt line and the status line above it, draw the
+# new status and put the prompt back. Built once; each redraw is a single format().
+if "\033" in _CLEAR_LINE:
+    _REDRAW = _CLEAR_LINE + "\033[F" + _CLEAR_LINE
+    _PROMPT = "\nInput your command here: "
+else:
+    # Legacy console (no cursor movement): status and prompt share one line
+    _REDRAW = _CLEAR_LINE
+    _PROMPT = " | Input your command here: "
+_TIMES = " | Session: {session} | Total: {total_time}"
+_FRAME_PROCESSING = _REDRAW + "📝 Processing chunk {next}/{total}" + _TIMES + " | ETA: {eta}" + _PROMPT
+_FRAME_COMPLETED = _REDRAW + "📝 Completed {done}/{total}" + _TIMES + _PROMPT
+_FRAME_MESSAGE = _REDRAW + "📝 {message}" + _TIMES + _PROMPT
+_FRAME_CHUNK_DONE = _REDRAW + "✅ Chunk {done}/{total} completed{size_info}\n📝 Processing chunk {next}/{total}" + _TIMES + " | ETA: {eta}" + _PROMPT
+_FRAME_ALL_DONE = _REDRAW + "✅ Chunk {done}/{total} completed{size_info}\n📝 All chunks completed!" + _TIMES + _PROMPT
+
+
+def _write_frame(frame):
+    """Write a status frame to stdout as bytes in one call, skipping the text layer."""
+    out = getattr(sys.stdout, 'buffer', None)
+    if out is None:
+        # Replaced stdout (e.g. a StringIO capture): plain text write
+        sys.stdout.write(frame)
+        sys.stdout.flush()
+        return
+    sys.stdout.flush()  # Anything print() left in the text layer goes out first
+    out.write(frame.encode(sys.stdout.encoding or 'utf-8', sys.stdout.errors or 'strict'))
+    out.flush()
+
+
+# Formatter behind the format_time methods, keyed by whole seconds
+@lru_cache(maxsize=4096)
+def _format_seconds(seconds):
+    if seconds < 60:
+        return f"{seconds}s"
+    elif seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    else:
+        return f"{seconds // 3600}h {(seconds % 3600) // 60}m"
+
 
 class ProgressTracker:
     """Enhanced progress tracker with improved time estimation and cumulative time tracking."""
@@ -13,179 +59,220 @@ class ProgressTracker:
         self.total_items = 0
         self.completed_items = 0
         self.current_status = ""
-        self._lock = threading.Lock()
         self._last_status_length = 0
-        self._start_time = None
-        self._chunk_times = []  # Track individual chunk completion times
+        self._start_time = None  # time.monotonic() at start; elapsed times only
+        self._last_draw = 0.0  # time.monotonic() of the last status redraw
         self._current_chunk_start = None  # Track current chunk start time
         self._checkpoint_mgr = checkpoint_mgr  # For updating cumulative time
         self._file_path = file_path  # File being processed
         self._previous_cumulative_time = 0.0  # Time from previous sessions
+        self._frames = queue.Queue()  # (message, force) status updates; None stops the renderer
+        self._renderer = None  # Thread drawing queued updates, started on first use
+        self._tty = sys.stdout.isatty()  # Redrawn frames on a terminal, plain lines otherwise
+        self._last_logged = 0  # completed_items when the last plain line was written
+        self._last_completed = 0  # Chunk count reached by the latest complete_chunk()
+        
+    def _begin(self, total_items, status):
+        """Reset counters and timing for a new tracking run."""
+        # No lock anywhere in this class: other threads only read these fields, and
+        # single attribute stores are atomic under CPython's GIL. total_items is
+        # written before completed_items so readers never see a count past the total.
+        self.total_items = total_items
+        self.completed_items = 0
+        self.current_status = status
+        self._last_status_length = 0
+        self._start_time = time.monotonic()
+        self._last_logged = 0
+        self._last_completed = 0
         
+        # Load previous cumulative time if available
+        if self._checkpoint_mgr and self._file_path:
+            self._previous_cumulative_time = self._checkpoint_mgr.get_cumulative_time(self._file_path)
+    
     def start(self, total_items, status="Starting..."):
         """Start progress tracking with cumulative time support."""
-        with self._lock:
-            self.total_items = total_items
-            self.completed_items = 0
-            self.current_status = status
-            self._last_status_length = 0
-            self._start_time = time.time()
-            
-            # Load previous cumulative time if available
-            if self._checkpoint_mgr and self._file_path:
-                self._previous_cumulative_time = self._checkpoint_mgr.get_cumulative_time(self._file_path)
+        self._begin(total_items, status)
         
         # Print initial status without clearing anything
         print(f"📊 Processing {total_items} chunks...")
-        print("Input your command here: ", end="", flush=True)
+        if self._tty:
+            print("Input your command here: ", end="", flush=True)
     
     def start_parallel(self, total_items, status="Starting parallel processing..."):
         """Start progress tracking for parallel processing."""
-        with self._lock:
-            self.total_items = total_items
-            self.completed_items = 0
-            self.current_status = status
-            self._last_status_length = 0
-            self._start_time = time.time()
-            
-            # Load previous cumulative time if available
-            if self._checkpoint_mgr and self._file_path:
-                self._previous_cumulative_time = self._checkpoint_mgr.get_cumulative_time(self._file_path)
+        self._begin(total_items, status)
         
         # Print initial status for parallel processing
         print(f"📊 Processing {total_items} chunks in parallel...")
     
-    def update(self, completed, status=""):
+    def update(self, completed, status="", force=False):
         """Update progress status, keeping command prompt at the bottom."""
-        with self._lock:
-            self.completed_items = completed
-            if status:
-                self.current_status = status
-                self._print_status_with_timing(status)
+        self.completed_items = completed
+        if status:
+            self.current_status = status
+            if not self._tty:
+                # Piped/redirected output: one plain line per finished chunk, no redraws
+                if completed > self._last_logged:
+                    self._last_logged = completed
+                    sys.stdout.write(f"[{completed}/{self.total_items}] {status}\n")
+                    sys.stdout.flush()
+                return
+            # Drawn by the renderer thread, keeping terminal I/O off the conversion path
+            self._ensure_renderer()
+            self._frames.put((status, force))
     
-    def _print_status_with_timing(self, message):
-        """Print status message with timing information, keeping input prompt at bottom."""
-        # Calculate timing information for display
-        session_elapsed = time.time() - self._start_time if self._start_time else 0
-        total_elapsed = session_elapsed + self._previous_cumulative_time
-        
-        # Calculate ETA for remaining chunks
-        eta_str = "calculating..."
-        if self.completed_items > 0 and self.total_items > 0:
-            remaining_items = self.total_items - self.completed_items
-            if remaining_items > 0:
-                # Use session time for ETA calculation (more recent performance)
-                if session_elapsed > 0:
-                    # Calculate average time per chunk in this session
-                    avg_time_per_item = session_elapsed / self.completed_items
-                    estimated_remaining_time = avg_time_per_item * remaining_items
-                    eta_str = self.format_time(estimated_remaining_time)
+    def _ensure_renderer(self):
+        """Start the status renderer thread if it is not running."""
+        if self._renderer is None or not self._renderer.is_alive():
+            self._renderer = threading.Thread(target=self._render_loop, daemon=True)
+            self._renderer.start()
+    
+    def _render_loop(self):
+        """Draw queued status updates until stop() sends None."""
+        held = None  # Newest update skipped by the redraw throttle, drawn once the interval ends
+        while True:
+            try:
+                if held is None:
+                    pending = [self._frames.get()]
                 else:
-                    eta_str = "calculating..."
-            else:
-                eta_str = "complete"
+                    remaining = self._last_draw + Config.MIN_REDRAW_INTERVAL - time.monotonic()
+                    pending = [self._frames.get(timeout=max(remaining, 0))]
+            except queue.Empty:
+                # Nothing newer arrived within the interval: show the held update now
+                self._print_status_with_timing(held[0], force=True)
+                held = None
+                continue
+            # Newest wins: fold in everything that queued up meanwhile
+            while True:
+                try:
+                    pending.append(self._frames.get_nowait())
+                except queue.Empty:
+                    break
+            
+            updates = [item for item in pending if item is not None]
+            if updates:
+                message = updates[-1][0]
+                force = any(forced for _, forced in updates) or (held is not None and held[1])
+                held = None if self._print_status_with_timing(message, force) else (message, force)
+            if len(updates) < len(pending):
+                if held is not None:
+                    self._print_status_with_timing(held[0], force=True)  # Final state before stopping
+                return
+    
+    def _print_status_with_timing(self, message, force=False):
+        """Print status message with timing information, keeping input prompt at bottom.
+        Returns False when the redraw throttle skipped it."""
+        # Coalesce rapid updates; the render loop redraws a skipped one when the interval ends
+        now = time.monotonic()
+        if not force and now - self._last_draw < Config.MIN_REDRAW_INTERVAL:
+            return False
+        self._last_draw = now
         
-        # Clear the current line and move cursor up to overwrite previous status
-        print("\r\033[K", end="")  # Clear current line
-        print("\033[F\r\033[K", end="")  # Move up one line and clear it
+        # Calculate timing information for display, all from the one clock reading
+        session_elapsed = now - self._start_time if self._start_time else 0
+        total_elapsed = session_elapsed + self._previous_cumulative_time
         
-        # Print timing info
-        session_str = self.format_time(session_elapsed)
-        total_str = self.format_time(total_elapsed)
+        # Calculate ETA for remaining chunks
+        eta_str = self._eta_str(session_elapsed)
         
-        if self.total_items > 0:
-            next_chunk = self.completed_items + 1
-            if next_chunk <= self.total_items:
-                print(f"📝 Processing chunk {next_chunk}/{self.total_items} | Session: {session_str} | Total: {total_str} | ETA: {eta_str}")
-            else:
-                print(f"📝 Completed {self.completed_items}/{self.total_items} | Session: {session_str} | Total: {total_str}")
+        # Pick the frame, then draw it in one write
+        next_chunk = self.completed_items + 1
+        if self.total_items <= 0:
+            frame = _FRAME_MESSAGE
+        elif next_chunk <= self.total_items:
+            frame = _FRAME_PROCESSING
         else:
-            print(f"📝 {message} | Session: {session_str} | Total: {total_str}")
-            
-        print("Input your command here: ", end="", flush=True)
+            frame = _FRAME_COMPLETED
+        _write_frame(frame.format(
+            message=message, next=next_chunk, done=self.completed_items, total=self.total_items,
+            session=self.format_time(session_elapsed), total_time=self.format_time(total_elapsed), eta=eta_str))
+        return True
     
     def stop(self, final_status="Stopped"):
         """Stop progress tracking."""
-        with self._lock:
-            session_elapsed = time.time() - self._start_time if self._start_time else 0
-            total_elapsed = session_elapsed + self._previous_cumulative_time
-            
-            # Update cumulative time in database if possible
-            if self._checkpoint_mgr and self._file_path:
-                self._checkpoint_mgr.update_cumulative_time(self._file_path, session_elapsed)
+        # Let the renderer draw what is queued and exit, so the final status comes last
+        renderer = self._renderer
+        if renderer is not None and renderer.is_alive():
+            self._frames.put(None)
+            renderer.join(timeout=1.0)
+        
+        session_elapsed = time.monotonic() - self._start_time if self._start_time else 0
+        total_elapsed = session_elapsed + self._previous_cumulative_time
+        
+        # Update cumulative time in database if possible
+        if self._checkpoint_mgr and self._file_path:
+            self._checkpoint_mgr.update_cumulative_time(self._file_path, session_elapsed)
         
         # Clear any partial progress lines and print final status
-        print("\r\033[K", end="")  # Clear current line
-        print(f"📝 {final_status}")
+        if self._tty:
+            _write_frame(f"{_CLEAR_LINE}📝 {final_status}\n")
+        else:
+            # The sequential loop updates before each chunk, so the last one was never logged
+            done = ""
+            if self._last_completed > self._last_logged:
+                self._last_logged = self._last_completed
+                done = f"[{self._last_completed}/{self.total_items}] Chunk {self._last_completed} completed\n"
+            _write_frame(f"{done}📝 {final_status}\n")
     
     def format_time(self, seconds):
         """Format time in a human-readable way."""
-        if seconds < 60:
-            return f"{int(seconds)}s"
-        elif seconds < 3600:
-            minutes = int(seconds // 60)
-            secs = int(seconds % 60)
-            return f"{minutes}m {secs}s"
-        else:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
+        # Whole seconds is the display resolution, so the cache key loses nothing
+        return _format_seconds(int(seconds))
+    
+    def _eta_str(self, session_elapsed):
+        """Estimate the remaining time from the session's average time per chunk."""
+        if self.completed_items <= 0 or self.total_items <= 0:
+            return "calculating..."
+        remaining_items = self.total_items - self.completed_items
+        if remaining_items <= 0:
+            return "complete"
+        if session_elapsed <= 0:
+            return "calculating..."
+        avg_time_per_item = session_elapsed / self.completed_items
+        return self.format_time(avg_time_per_item * remaining_items)
     
     def start_chunk(self):
         """Mark the start of chunk processing for timing."""
-        self._current_chunk_start = time.time()
+        self._current_chunk_start = time.monotonic()
     
-    def complete_chunk(self):
+    def complete_chunk(self, now=None):
         """Mark chunk completion and return processing time."""
         if self._current_chunk_start:
-            chunk_time = time.time() - self._current_chunk_start
-            self._chunk_times.append(chunk_time)
+            if now is None:
+                now = time.monotonic()
+            chunk_time = now - self._current_chunk_start
             self._current_chunk_start = None
+            self._last_completed = self.completed_items + 1
             return chunk_time
         return 0
     
     def complete_chunk_with_size(self, chunk_size=""):
         """Complete a chunk and show completion message with size info."""
-        chunk_time = self.complete_chunk()  # Call existing method
+        now = time.monotonic()  # One clock reading for the chunk time and the status line
+        chunk_time = self.complete_chunk(now)  # Call existing method
         
-        with self._lock:
-            # Clear the current line and input prompt to show completion
-            print("\r\033[K", end="")  # Clear current line
-            print("\033[F\r\033[K", end="")  # Move up one line and clear it
-            
-            # Show completion message
+        if not self._tty:
+            self._last_logged = self.completed_items
             size_info = f" ({chunk_size})" if chunk_size else ""
-            print(f"✅ Chunk {self.completed_items}/{self.total_items} completed{size_info}")
-            
-            # Now show processing info for next chunk if not complete
-            session_elapsed = time.time() - self._start_time if self._start_time else 0
-            total_elapsed = session_elapsed + self._previous_cumulative_time
-            
-            # Calculate ETA for remaining chunks
-            eta_str = "calculating..."
-            if self.completed_items > 0 and self.total_items > 0:
-                remaining_items = self.total_items - self.completed_items
-                if remaining_items > 0:
-                    if session_elapsed > 0:
-                        avg_time_per_item = session_elapsed / self.completed_items
-                        estimated_remaining_time = avg_time_per_item * remaining_items
-                        eta_str = self.format_time(estimated_remaining_time)
-                    else:
-                        eta_str = "calculating..."
-                else:
-                    eta_str = "complete"
-            
-            session_str = self.format_time(session_elapsed)
-            total_str = self.format_time(total_elapsed)
-            
-            # Show next chunk processing info if not complete
-            next_chunk = self.completed_items + 1
-            if next_chunk <= self.total_items:
-                print(f"📝 Processing chunk {next_chunk}/{self.total_items} | Session: {session_str} | Total: {total_str} | ETA: {eta_str}")
-            else:
-                print(f"📝 All chunks completed! | Session: {session_str} | Total: {total_str}")
-                
-            print("Input your command here: ", end="", flush=True)
+            _write_frame(f"✅ Chunk {self.completed_items}/{self.total_items} completed{size_info}\n")
+            return chunk_time
+        
+        # Completion message, shown in place of the status line and input prompt,
+        # followed by processing info for the next chunk if not complete
+        session_elapsed = now - self._start_time if self._start_time else 0
+        total_elapsed = session_elapsed + self._previous_cumulative_time
+        
+        # Calculate ETA for remaining chunks
+        eta_str = self._eta_str(session_elapsed)
+        
+        next_chunk = self.completed_items + 1
+        frame = _FRAME_CHUNK_DONE if next_chunk <= self.total_items else _FRAME_ALL_DONE
+        # One write per frame, so this and the renderer thread never interleave mid-frame
+        _write_frame(frame.format(
+            done=self.completed_items, next=next_chunk, total=self.total_items,
+            size_info=f" ({chunk_size})" if chunk_size else "",
+            session=self.format_time(session_elapsed), total_time=self.format_time(total_elapsed), eta=eta_str))
+        self._last_draw = now
         
         return chunk_time
 
@@ -2,11 +2,15 @@
 """
 Shutdown and user command handling for the TTS converter.
 """
+import os
 import sys
 import time
 import signal
+import selectors
 import threading
 from .config import Config
+from .utils import _CLEAR_LINE
+
 
 class ShutdownHandler:
     """Handles graceful shutdown and user commands."""
@@ -14,6 +18,8 @@ class ShutdownHandler:
     def __init__(self, progress_tracker):
         self.shutdown_requested = False
         self.pause_requested = False
+        self._resume_event = threading.Event()  # Set while not paused; handle_pause waits on it
+        self._resume_event.set()
         self.delete_progress_requested = False
         self.force_stop_requested = False  # New flag for force stop
         self.progress_tracker = progress_tracker
@@ -50,18 +56,93 @@ class ShutdownHandler:
     
     def _listen_for_input(self):
         """Listen for user commands."""
-        while not self.shutdown_requested:
+        # Without a terminal nobody can type commands; don't spin on a closed/redirected stdin
+        if sys.stdin is None or not sys.stdin.isatty():
+            return
+        
+        selector = None
+        if os.name != 'nt':  # Windows select() only takes sockets, not the console
             try:
-                user_input = input().strip().lower()
-                if user_input:
-                    self._process_command(user_input)
-            except (EOFError, KeyboardInterrupt):
-                # Treat Ctrl+C like a normal stop command, not force stop
-                print(f"\n{Config.STOP_EMOJI} Stop requested via Ctrl+C")
-                self.shutdown_requested = True
-                break
-            except Exception:
-                time.sleep(0.1)
+                selector = selectors.DefaultSelector()
+                selector.register(sys.stdin.fileno(), selectors.EVENT_READ)
+            except (OSError, ValueError):
+                selector = None  # Fall back to blocking in readline
+        
+        fd = sys.stdin.fileno()
+        encoding = sys.stdin.encoding or 'utf-8'
+        pending = b""  # Bytes read after the last newline
+        try:
+            while not self.shutdown_requested:
+                if selector is not None:
+                    # Sleep in select until input arrives; the timeout notices shutdowns
+                    try:
+                        ready = selector.select(timeout=0.5)
+                    except OSError:
+                        selector.close()
+                        selector = None  # This console can't be polled: block in readline
+                        continue
+                    if not ready:
+                        continue
+                    # Raw read, so no typed lines wait in a Python buffer select can't see
+                    data = os.read(fd, 1024)
+                    if not data:
+                        raise EOFError
+                    *complete, pending = (pending + data).split(b"\n")
+                    lines = [line.decode(encoding, 'replace') for line in complete]
+                else:
+                    line = sys.stdin.readline()
+                    if not line:
+                        raise EOFError
+                    lines = [line]
+                
+                for line in lines:
+                    user_input = line.strip().lower()
+                    if user_input:
+                        self._process_command(user_input)
+        except (EOFError, KeyboardInterrupt):
+            # Treat Ctrl+C like a normal stop command, not force stop
+            print(f"\n{Config.STOP_EMOJI} Stop requested via Ctrl+C")
+            self.shutdown_requested = True
+        except (OSError, ValueError):
+            pass  # stdin was closed; no more commands
+        finally:
+            if selector is not None:
+                selector.close()
+    
+    def _do_pause(self):
+        """Pause after the current chunk."""
+        self.pause_requested = True
+        self._resume_event.clear()
+        print(f"{Config.PAUSE_EMOJI} Pause requested. Will pause after current chunk...")
+    
+    def _do_resume(self):
+        """Resume from pause."""
+        if self.pause_requested:
+            self.pause_requested = False
+            self._resume_event.set()  # Wake handle_pause immediately
+            print(f"{Config.RESUME_EMOJI} Resuming...")
+    
+    def _do_stop(self):
+        """Stop and save progress."""
+        print(f"{Config.STOP_EMOJI} Stop requested. Finishing current chunk...")
+        self.shutdown_requested = True
+    
+    def _do_quit(self):
+        """Quit, saving progress."""
+        print(f"{Config.STOP_EMOJI} Quit requested. Finishing current chunk...")
+        self.shutdown_requested = True
+    
+    def _do_force_stop(self):
+        """Stop immediately; the current chunk is redone on resume."""
+        print(f"⚡ Force stop requested! Stopping immediately without finishing current chunk...")
+        self.shutdown_requested = True
+        self.force_stop_requested = True
+    
+    def _do_stop_delete(self):
+        """Stop and delete all progress."""
+        print(f"🗑️ Stop and delete progress requested. Will delete all progress after current chunk...")
+        self.shutdown_requested = True
+        self.delete_progress_requested = True
     
     def _process_command(self, command):
         """Process user command."""
@@ -70,33 +151,13 @@ class ShutdownHandler:
             return
             
         # Clear the current input line before printing command response
-        print("\r\033[K", end="")  # Clear current line
+        print(_CLEAR_LINE, end="")  # Clear current line
         
-        if command in ['p', 'pause']:
-            self.pause_requested = True
-            print(f"{Config.PAUSE_EMOJI} Pause requested. Will pause after current chunk...")
-        elif command in ['r', 'resume']:
-            if self.pause_requested:
-                self.pause_requested = False
-                print(f"{Config.RESUME_EMOJI} Resuming...")
-        elif command in ['s', 'stop']:
-            print(f"{Config.STOP_EMOJI} Stop requested. Finishing current chunk...")
-            self.shutdown_requested = True
-        elif command in ['q', 'quit']:
-            print(f"{Config.STOP_EMOJI} Quit requested. Finishing current chunk...")
-            self.shutdown_requested = True
-        elif command in ['f', 'force', 'fs', 'force-stop']:
-            print(f"⚡ Force stop requested! Stopping immediately without finishing current chunk...")
-            self.shutdown_requested = True
-            self.force_stop_requested = True
-        elif command in ['sd', 'stop-delete', 'delete', 'abort']:
-            print(f"🗑️ Stop and delete progress requested. Will delete all progress after current chunk...")
-            self.shutdown_requested = True
-            self.delete_progress_requested = True
-        elif command in ['h', 'help']:
-            self._show_help()
-        elif command in ['c', 'clear']:
-            self._clear_console()
+        handler = self._COMMANDS.get(command)
+        if handler is not None:
+            handler(self)
+            if self.shutdown_requested:
+                self._resume_event.set()  # A stop while paused shouldn't wait out the pause
         
         # Restore the input prompt if we're still processing
         if not self.shutdown_requested:
@@ -129,15 +190,26 @@ class ShutdownHandler:
         print("📝 Console cleared. Processing continues...")
         print("Input your command here: ", end="", flush=True)
     
+    # Command aliases -> handler, resolved with one dict lookup per command
+    _COMMANDS = {
+        'p': _do_pause, 'pause': _do_pause,
+        'r': _do_resume, 'resume': _do_resume,
+        's': _do_stop, 'stop': _do_stop,
+        'q': _do_quit, 'quit': _do_quit,
+        'f': _do_force_stop, 'force': _do_force_stop, 'fs': _do_force_stop, 'force-stop': _do_force_stop,
+        'sd': _do_stop_delete, 'stop-delete': _do_stop_delete, 'delete': _do_stop_delete, 'abort': _do_stop_delete,
+        'h': _show_help, 'help': _show_help,
+        'c': _clear_console, 'clear': _clear_console,
+    }
+    
     def _clear_line_and_print(self, message):
         """Clear progress line and print message."""
-        self._clear_line()
-        sys.stdout.write(f"{message}\n")
+        sys.stdout.write(f"{_CLEAR_LINE}{message}\n")
         sys.stdout.flush()
     
     def _clear_line(self):
         """Clear current line."""
-        sys.stdout.write('\r' + ' ' * Config.TERMINAL_WIDTH + '\r')
+        sys.stdout.write(_CLEAR_LINE)
         sys.stdout.flush()
     
     def should_continue(self):
@@ -147,13 +219,14 @@ class ShutdownHandler:
     def handle_pause(self):
         """Handle pause functionality."""
         if self.pause_requested:
-            print("\r\033[K", end="")  # Clear current line
+            print(_CLEAR_LINE, end="")  # Clear current line
             print(f"{Config.PAUSE_EMOJI} PAUSED - Press 'r' and Enter to resume")
             print("Input your command here: ", end="", flush=True)
             while self.pause_requested and not self.shutdown_requested:
-                time.sleep(0.1)
+                # Wakes as soon as resume/stop sets the event; the timeout catches SIGTERM
+                self._resume_event.wait(timeout=1.0)
             if not self.shutdown_requested:
-                print("\r\033[K", end="")  # Clear current line
+                print(_CLEAR_LINE, end="")  # Clear current line
                 print(f"{Config.RESUME_EMOJI} RESUMED")
                 time.sleep(1)
                 print("Input your command here: ", end="", flush=True)
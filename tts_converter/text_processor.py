@@ -4,10 +4,31 @@ Text processing functionality for the TTS converter.
 """
 import os
 import json
-import glob
+import re
 import hashlib
+from functools import lru_cache
 from .config import Config
 
+# Change-detection hash for boundary files; stored alongside so other algorithms are ignored
+_TEXT_HASH_ALGO = 'blake2b'
+
+# Greedy match up to the last whitespace character; \s is the same set as str.isspace()
+_UP_TO_LAST_SPACE = re.compile(r'.*\s', re.DOTALL)
+
+
+@lru_cache(maxsize=256)
+def _boundary_file_name(file_path):
+    # Unique name from the original file name and a hash of its path
+    file_name = os.path.basename(file_path)
+    path_hash = hashlib.blake2b(file_path.encode('utf-8'), digest_size=4).hexdigest()  # 8 hex chars
+    return f"{file_name}_{path_hash}{Config.CHUNK_BOUNDARIES_SUFFIX}"
+
+
+def _text_hash(text):
+    """Hash the full text to detect changes since the boundaries were saved."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
 class TextProcessor:
     """Handles text extraction and chunking."""
     
@@ -15,25 +36,41 @@ class TextProcessor:
     def extract_from_file(file_path):
         """Extract text from file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            # One binary read and a single decode instead of the incremental text-mode decoder
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            text = data.decode('utf-8')
+            if '\r' in text:
+                # Keep text mode's universal-newline translation so chunking is unchanged
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
         except Exception as e:
             raise Exception(f"Error reading file: {e}")
     
     @staticmethod 
     def split_into_chunks(text, max_chars=Config.DEFAULT_CHUNK_SIZE, file_path=None):
         """Split text into processable chunks."""
-        if not text.strip():
-            return []
+        return list(TextProcessor.iter_chunks(text, max_chars, file_path))
+    
+    @staticmethod
+    def iter_chunks(text, max_chars=Config.DEFAULT_CHUNK_SIZE, file_path=None):
+        """Yield processable chunks one at a time."""
+        if not text or text.isspace():
+            return  # isspace() scans in place instead of building a stripped copy
+        
+        # Rechunking a small text is cheaper than the boundary file's I/O and hash
+        if len(text) < Config.MIN_BOUNDARY_CACHE_CHARS:
+            file_path = None
         
         # Try to load existing chunk boundaries for consistency
         if file_path:
-            existing_chunks = TextProcessor._load_chunk_boundaries(file_path, text)
+            text_hash = _text_hash(text)  # Encoded and hashed once for both load and save
+            existing_chunks = TextProcessor._load_chunk_boundaries(file_path, text, text_hash)
             if existing_chunks:
-                return existing_chunks
+                yield from existing_chunks
+                return
         
         # Create new chunks
-        chunks = []
         current_pos = 0
         boundaries = []
         
@@ -48,24 +85,24 @@ class TextProcessor:
                 if sentence_end != -1 and sentence_end > chunk_start + max_chars // 2:
                     chunk_end = sentence_end + 2
                 else:
-                    # Try word boundary
-                    while chunk_end > chunk_start and not text[chunk_end - 1].isspace():
-                        chunk_end -= 1
-                    if chunk_end == chunk_start:
-                        chunk_end = min(current_pos + max_chars, len(text))
+                    # Try word boundary: end just after the last whitespace in the window
+                    word_end = _UP_TO_LAST_SPACE.match(text, chunk_start, chunk_end)
+                    if word_end:
+                        chunk_end = word_end.end()
             
-            chunk = text[chunk_start:chunk_end].strip()
+            raw_chunk = text[chunk_start:chunk_end]
+            chunk = raw_chunk.strip()
             if chunk:
-                chunks.append(chunk)
-                boundaries.append([chunk_start, chunk_end])
+                # Save the stripped range so loading is a plain slice; only whitespace precedes chunk[0]
+                stripped_start = chunk_start + raw_chunk.find(chunk[0])
+                boundaries.append([stripped_start, stripped_start + len(chunk)])
+                yield chunk
             
             current_pos = chunk_end
         
-        # Save chunk boundaries for future consistency
+        # Save chunk boundaries for future consistency (only reached once every chunk was produced)
         if file_path and boundaries:
-            TextProcessor._save_chunk_boundaries(file_path, text, boundaries)
-        
-        return chunks
+            TextProcessor._save_chunk_boundaries(file_path, text_hash, boundaries)
     
     @staticmethod
     def _get_boundary_file_path(file_path):
@@ -74,49 +111,65 @@ class TextProcessor:
         # Get the project directory
         project_dir = Config.get_project_path()
         
-        # Create a unique filename based on the original file name and path hash
-        file_name = os.path.basename(file_path)
-        path_hash = hashlib.md5(file_path.encode('utf-8')).hexdigest()[:8]  # Use first 8 chars of hash
-        boundary_file_name = f"{file_name}_{path_hash}{Config.CHUNK_BOUNDARIES_SUFFIX}"
-        
-        # Return the full path to the boundary file in the project directory
-        return os.path.join(project_dir, boundary_file_name)
+        # The name depends only on file_path, so it is computed once per path
+        # (project_dir isn't cached: BASE_DIR may be reassigned)
+        return os.path.join(project_dir, _boundary_file_name(file_path))
 
     @staticmethod
-    def _load_chunk_boundaries(file_path, text):
+    def _load_chunk_boundaries(file_path, text, text_hash):
         """Load existing chunk boundaries."""
         boundary_file = TextProcessor._get_boundary_file_path(file_path)
         try:
-            with open(boundary_file, 'r') as f:
-                data = json.load(f)
+            with open(boundary_file, 'rb') as f:
+                data = json.loads(f.read())
             
-            # Verify text hasn't changed
-            text_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-            if data.get('text_hash') == text_hash:
-                chunks = []
-                for start, end in data['boundaries']:
-                    chunk = text[start:end].strip()
-                    if chunk:
-                        chunks.append(chunk)
-                return chunks
-        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            # Verify text hasn't changed (older MD5-hashed files simply don't match)
+            if data.get('hash_algo') == _TEXT_HASH_ALGO and data.get('text_hash') == text_hash:
+                bounds = data['boundaries']
+                if bounds and isinstance(bounds[0], list):
+                    bounds = [pos for pair in bounds for pos in pair]  # Older [[start, end], ...] layout
+                # Flat [s0, e0, s1, e1, ...]: pair up starts and ends without per-item unpacking
+                pairs = zip(bounds[::2], bounds[1::2])
+                if data.get('stripped'):
+                    # Ranges were saved already stripped and non-empty
+                    return [text[start:end] for start, end in pairs]
+                chunks = [text[start:end].strip() for start, end in pairs]
+                return [chunk for chunk in chunks if chunk]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
             pass
         return None
     
     @staticmethod
-    def _save_chunk_boundaries(file_path, text, boundaries):
+    def _save_chunk_boundaries(file_path, text_hash, boundaries):
         """Save chunk boundaries for consistency."""
         boundary_file = TextProcessor._get_boundary_file_path(file_path)
         try:
             data = {
-                'text_hash': hashlib.md5(text.encode('utf-8')).hexdigest(),
-                'boundaries': boundaries
+                'hash_algo': _TEXT_HASH_ALGO,
+                'text_hash': text_hash,
+                'stripped': True,  # Ranges exclude surrounding whitespace
+                'boundaries': [pos for pair in boundaries for pos in pair]  # Flat start/end list
             }
-            with open(boundary_file, 'w') as f:
-                json.dump(data, f)
+            # Compact separators and a single write of the encoded document
+            temp_file = boundary_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+            # Atomic swap: an interrupted save never leaves a truncated boundary file behind
+            os.replace(temp_file, boundary_file)
         except Exception as e:
             print(f"⚠️ Could not save chunk boundaries: {e}")
     
+    @staticmethod
+    def list_boundary_files(directory):
+        """List chunk boundary files in a directory with a single scan."""
+        try:
+            with os.scandir(directory) as entries:
+                # DirEntry.is_file uses the type from the directory listing, no extra stat
+                return [entry.path for entry in entries
+                        if entry.name.endswith(Config.CHUNK_BOUNDARIES_SUFFIX) and entry.is_file(follow_symlinks=False)]
+        except FileNotFoundError:
+            return []
+    
     @staticmethod
     def cleanup_chunk_boundaries(file_path):
         """Clean up chunk boundary files."""
@@ -133,7 +186,7 @@ class TextProcessor:
         else:
             # Clean up all boundary files in the project directory
             project_dir = Config.get_project_path()
-            boundary_files = glob.glob(os.path.join(project_dir, f"*{Config.CHUNK_BOUNDARIES_SUFFIX}"))
+            boundary_files = TextProcessor.list_boundary_files(project_dir)
             cleaned = False
             for boundary_file in boundary_files:
                 try:
@@ -9,6 +9,7 @@ import glob
 from functools import wraps
 from .config import Config
 from .text_processor import TextProcessor
+from .utils import TTSUtils
 from .multiprocessing_manager import MultiprocessingManager
 
 class TTSProcessor:
@@ -37,8 +38,7 @@ class TTSProcessor:
                     except Exception as e:
                         if attempt == max_retries - 1:
                             raise e
-                        delay = base_delay * (2 ** attempt)
-                        time.sleep(delay)
+                        time.sleep(TTSUtils.retry_delay(attempt, e, base_delay))
                 return None
             return wrapper
         return decorator
@@ -46,9 +46,8 @@ class TTSProcessor:
     @retry_with_backoff()
     def _convert_chunk_to_speech(self, text, filename, language='en', slow=False):
         """Convert single text chunk to speech."""
-        from gtts import gTTS  # type: ignore
-        tts = gTTS(text=text, lang=language, slow=slow)
-        tts.save(filename)
+        # Same synthesis path as parallel mode: keep-alive HTTP and the audio cache
+        self.multiprocessing_mgr.synthesize(text, language, slow, filename)
         return True
     
     def process_file(self, file_path, output_file=None, language='en', slow=False, output_dir=None, prefix=None):
@@ -273,12 +272,13 @@ class TTSProcessor:
                                         'processing',
                                         prefix=prefix
                                     )
+                                    self.checkpoint_mgr.flush()  # Record the failure before raising
                                     raise Exception(
                                         f"Failed to convert chunk {i+1} after {max_attempts} attempts: {e}"
                                     )
                                 else:
-                                    delay = Config.RETRY_DELAY * (2 ** attempt)
-                                    print(f"\n⚠️ Error processing chunk {i+1}, retrying in {delay}s: {e}")
+                                    delay = TTSUtils.retry_delay(attempt, e)
+                                    print(f"\n⚠️ Error processing chunk {i+1}, retrying in {delay:.1f}s: {e}")
                                     time.sleep(delay)
                     
                     if not self.shutdown_handler.should_continue():
@@ -296,6 +296,8 @@ class TTSProcessor:
                         )
                         break
             
+            # Commit any buffered checkpoint saves before wrapping up
+            self.checkpoint_mgr.flush()
             self.progress_tracker.stop("Processing complete")
             
             # Check if all chunks were completed
@@ -312,6 +314,10 @@ class TTSProcessor:
         except Exception as e:
             self.progress_tracker.stop("Error")
             raise e
+        finally:
+            # Buffered saves must reach the database on every exit path
+            # (failed chunk, Ctrl+C), not just the normal one
+            self.checkpoint_mgr.flush()
     
     def _process_single_chunk(self, chunk, output_file, language, slow, file_path):
         """Process single chunk."""
@@ -322,12 +328,13 @@ class TTSProcessor:
             # Check for force stop after conversion
             if self.shutdown_handler.should_force_stop():
                 # Delete the incomplete audio file if force stop requested
-                if os.path.exists(output_file):
-                    try:
-                        os.remove(output_file)
-                        print(f"\n⚡ Force stop requested - removed incomplete file: {os.path.basename(output_file)}")
-                    except Exception as e:
-                        print(f"\n⚠️ Force stop: Could not remove incomplete file: {e}")
+                try:
+                    os.unlink(output_file)
+                    print(f"\n⚡ Force stop requested - removed incomplete file: {os.path.basename(output_file)}")
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"\n⚠️ Force stop: Could not remove incomplete file: {e}")
                 
                 # Save progress with force_stopped status
                 self.checkpoint_mgr.save_progress(
@@ -396,12 +403,13 @@ class TTSProcessor:
                         # Check for force stop request after conversion
                         if self.shutdown_handler.should_force_stop():
                             # Delete the incomplete audio file if force stop requested
-                            if os.path.exists(temp_file):
-                                try:
-                                    os.remove(temp_file)
-                                    print(f"\n⚡ Force stop requested - removed incomplete file: {os.path.basename(temp_file)}")
-                                except Exception as e:
-                                    print(f"\n⚠️ Force stop: Could not remove incomplete file: {e}")
+                            try:
+                                os.unlink(temp_file)
+                                print(f"\n⚡ Force stop requested - removed incomplete file: {os.path.basename(temp_file)}")
+                            except FileNotFoundError:
+                                pass
+                            except OSError as e:
+                                print(f"\n⚠️ Force stop: Could not remove incomplete file: {e}")
                             
                             # Save progress with force_stopped status
                             self.checkpoint_mgr.save_progress(
@@ -449,15 +457,18 @@ class TTSProcessor:
                                 temp_files, output_file, language, slow, 'processing',
                                 prefix=prefix
                             )
+                            self.checkpoint_mgr.flush()  # A failed chunk is worth committing right away
                         else:
                             # Retry
-                            delay = Config.RETRY_DELAY * (2 ** attempt)
-                            print(f"\n⚠️ Error processing chunk {i+1}, retrying in {delay}s: {e}")
+                            delay = TTSUtils.retry_delay(attempt, e)
+                            print(f"\n⚠️ Error processing chunk {i+1}, retrying in {delay:.1f}s: {e}")
                             time.sleep(delay)
                 
                 if not self.shutdown_handler.should_continue():
                     break
             
+            # Commit any buffered checkpoint saves before wrapping up
+            self.checkpoint_mgr.flush()
             self.progress_tracker.stop("Processing complete")
             
             # Check if all chunks were completed
@@ -474,6 +485,10 @@ class TTSProcessor:
         except Exception as e:
             self.progress_tracker.stop("Error")
             raise e
+        finally:
+            # Buffered saves must reach the database on every exit path
+            # (failed chunk, Ctrl+C), not just the normal one
+            self.checkpoint_mgr.flush()
     
     def _cleanup_after_processing(self, file_path):
         """Clean up progress files after successful processing."""
@@ -509,12 +524,13 @@ class TTSProcessor:
                 temp_files = temp_files[:-1]
                 
                 # Delete the potentially incomplete file if it exists
-                if os.path.exists(last_temp_file):
-                    try:
-                        os.remove(last_temp_file)
-                        print(f"🧹 Removed incomplete chunk file: {os.path.basename(last_temp_file)}")
-                    except Exception as e:
-                        print(f"⚠️ Could not remove incomplete chunk file: {e}")
+                try:
+                    os.unlink(last_temp_file)
+                    print(f"🧹 Removed incomplete chunk file: {os.path.basename(last_temp_file)}")
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"⚠️ Could not remove incomplete chunk file: {e}")
                         
             print(f"💡 Will restart from chunk {completed_chunks + 1}")
             print("="*60 + "\n")
@@ -4,7 +4,23 @@ Utility functions for the TTS converter.
 """
 import os
 import sys
+import random
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from .config import Config
+
+
+def _pick_clear_line():
+    """Choose the clear-line sequence for this console once, at import."""
+    if not sys.stdout.isatty():
+        return ""  # Redirected output: nothing on screen to erase
+    if os.name == 'nt' and not (os.environ.get('WT_SESSION') or os.environ.get('ANSICON') or os.environ.get('TERM')):
+        # Legacy Windows console without ANSI support: overwrite with spaces instead
+        return "\r" + " " * Config.TERMINAL_WIDTH + "\r"
+    return "\r\033[2K"  # Carriage return + ANSI "erase entire line"
+
+# Fixed for the whole run - the console type doesn't change mid-run
+_CLEAR_LINE = _pick_clear_line()
 
 class TTSUtils:
     """Utility functions for the TTS converter."""
@@ -83,6 +99,44 @@ class TTSUtils:
             raise Exception(f"File not readable: {file_path}")
         return True
     
+    @staticmethod
+    def _unlink(path):
+        """Remove one file, returning the error instead of raising it."""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return None  # Already gone, nothing to report
+        except OSError as e:
+            return e
+        return None
+    
+    @staticmethod
+    def remove_files(paths, max_workers=8):
+        """Remove many files in parallel; returns a list of (path, error) failures."""
+        paths = list(paths)
+        if len(paths) <= 1:
+            errors = [TTSUtils._unlink(p) for p in paths]
+        else:
+            # unlink releases the GIL, so independent removes overlap well
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+                errors = list(pool.map(TTSUtils._unlink, paths))
+        return [(p, e) for p, e in zip(paths, errors) if e is not None]
+    
+    @staticmethod
+    def retry_delay(attempt, error=None, base_delay=Config.RETRY_DELAY):
+        """Seconds to wait before retry number attempt+1 of a failed TTS request."""
+        # Honour the server's Retry-After on rate limiting / overload responses
+        response = getattr(error, 'rsp', None)
+        if response is not None and response.status_code in (429, 503):
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(float(retry_after), Config.MAX_RETRY_DELAY)
+                except ValueError:
+                    pass  # HTTP-date form; fall back to backoff
+        # Full jitter so parallel workers that failed together don't retry together
+        return random.uniform(0, min(Config.MAX_RETRY_DELAY, base_delay * (2 ** attempt)))
+    
     @staticmethod
     def validate_language(language_code):
         """Validate language code."""
@@ -21,6 +21,7 @@ if sys.version_info < (3, 6):
 
 import os
 import glob
+import atexit
 import argparse
 import time
 
@@ -31,6 +32,7 @@ from tts_converter.checkpoint import CheckpointManager
 from tts_converter.text_processor import TextProcessor
 from tts_converter.shutdown import ShutdownHandler
 from tts_converter.tts_processor import TTSProcessor
+from tts_converter.multiprocessing_manager import MultiprocessingManager
 from tts_converter.utils import TTSUtils
 from tts_converter.file_manager import FileManager
 
@@ -153,7 +155,7 @@ def cleanup_old_progress_files():
     
     print("🧹 Global cleanup of old progress files")
     print("=" * 60)
-    print("⚠️  This will remove ALL progress databases and boundaries files.")
+    print("⚠️  This will remove ALL progress databases, boundaries files and cached audio chunks.")
     print("⚠️  Any ongoing TTS processes will need to restart from the beginning.")
     print("📁 TTS .mp3 files will be preserved as they are the conversion results.")
     print("=" * 60)
@@ -182,7 +184,7 @@ def cleanup_old_progress_files():
     
     # Find and remove boundary files
     try:
-        boundary_files = glob.glob(os.path.join(project_dir, "*_chunk_boundaries.json"))
+        boundary_files = TextProcessor.list_boundary_files(project_dir)
         if boundary_files:
             for boundary_file in boundary_files:
                 try:
@@ -195,6 +197,16 @@ def cleanup_old_progress_files():
     except Exception as e:
         print(f"⚠️ Error during boundary file cleanup: {e}")
     
+    # Remove the cache of synthesized chunks
+    try:
+        removed = MultiprocessingManager.clear_audio_cache()
+        if removed:
+            print(f"🧹 Removed {removed} cached audio chunks")
+        else:
+            print("ℹ️ No cached audio chunks found")
+    except Exception as e:
+        print(f"⚠️ Error during audio cache cleanup: {e}")
+    
     # Find and report temp files (but preserve .mp3 files)
     try:
         temp_files = glob.glob(os.path.join(project_dir, "temp_chunk_*.mp3"))
@@ -243,6 +255,7 @@ def main(recursive_call=False):
     
     # Create components
     checkpoint_mgr = CheckpointManager()
+    atexit.register(checkpoint_mgr.close)  # Commit buffered progress however the run ends
     progress_tracker = ProgressTracker()
     shutdown_handler = ShutdownHandler(progress_tracker)
     tts_processor = TTSProcessor(checkpoint_mgr, progress_tracker, shutdown_handler)
@@ -462,13 +475,15 @@ def main(recursive_call=False):
                             try:
                                 # Delete all mp3 files in the folder
                                 audio_files = glob.glob(os.path.join(output_folder, "*.mp3"))
-                                for audio_file in audio_files:
-                                    os.remove(audio_file)
-                                    print(f"🧹 Removed audio file: {os.path.basename(audio_file)}")
+                                failures = TTSUtils.remove_files(audio_files)
+                                for audio_file, e in failures:
+                                    print(f"⚠️ Could not remove {os.path.basename(audio_file)}: {e}")
+                                print(f"🧹 Removed {len(audio_files) - len(failures)} audio files")
                                 
                                 # Try to remove the folder if empty
                                 if os.path.exists(output_folder) and len(os.listdir(output_folder)) == 0:
                                     os.rmdir(output_folder)
+                                    Config.forget_output_dir(output_folder)
                                     print(f"🧹 Removed empty output folder: {os.path.basename(output_folder)}")
                                 elif os.path.exists(output_folder):
                                     print(f"⚠️ Output folder not empty, skipping folder removal")
@@ -639,6 +654,7 @@ def main(recursive_call=False):
         
         # Final attempt to clean up progress files if they still exist
         cleanup_errors = []
+        checkpoint_mgr.close()  # Release cached connections before removing databases
         try:
             project_dir = Config.get_project_path()
             
@@ -648,7 +664,7 @@ def main(recursive_call=False):
                 # Ensure we catch the tts_checkpoints.db file
                 if "tts" in db_file.lower() or "checkpoint" in db_file.lower():
                     try:
-                        os.remove(db_file)
+                        CheckpointManager._remove_db_file(db_file)
                         print(f"🧹 Final cleanup - removed checkpoint database: {os.path.basename(db_file)}")
                     except Exception as e:
                         cleanup_errors.append(f"Database {os.path.basename(db_file)}: {e}")
@@ -657,13 +673,13 @@ def main(recursive_call=False):
             checkpoints_db = os.path.join(project_dir, "tts_checkpoints.db")
             if os.path.exists(checkpoints_db):
                 try:
-                    os.remove(checkpoints_db)
+                    CheckpointManager._remove_db_file(checkpoints_db)
                     print(f"🧹 Final cleanup - removed main checkpoints database")
                 except Exception as e:
                     cleanup_errors.append(f"Main checkpoints database: {e}")
             
             # Find and remove any chunk boundary files
-            boundary_files = glob.glob(os.path.join(project_dir, "*_chunk_boundaries.json"))
+            boundary_files = TextProcessor.list_boundary_files(project_dir)
             for b_file in boundary_files:
                 try:
                     os.remove(b_file)
@@ -671,6 +687,12 @@ def main(recursive_call=False):
                 except Exception as e:
                     cleanup_errors.append(f"Boundaries file {os.path.basename(b_file)}: {e}")
             
+            # Keep the audio cache within its size limit
+            try:
+                MultiprocessingManager.prune_audio_cache()
+            except Exception as e:
+                cleanup_errors.append(f"Audio cache: {e}")
+            
             if cleanup_errors:
                 print(f"⚠️ Some cleanup operations had issues:")
                 for error in cleanup_errors: